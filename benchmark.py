@@ -0,0 +1,202 @@
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+
+from src.entities import ClusterizationAlgorithm, CompressionAlgorithm, SimpleStrategy, RGBGame, Player
+from src.parser import build_board_by_rows
+
+
+SIZES = ((10, 15), (20, 30), (50, 75))
+
+DISTRIBUTIONS = {
+    'uniform': (1, 1, 1),
+    'skewed': (6, 1, 1),
+    'two-colors': (1, 1, 0),
+}
+
+
+def main():
+    arguments = parse_arguments()
+
+    report = {
+        'commit': get_commit(),
+        'python': platform.python_version(),
+        'seed': arguments.seed,
+        'count_boards': arguments.count_boards,
+        'results': [],
+    }
+
+    for count_rows, count_columns in parse_sizes(arguments.sizes):
+        for distribution in arguments.distributions:
+            result = run_benchmark(count_rows, count_columns, distribution, arguments.count_boards, arguments.seed)
+
+            report['results'].append(result)
+
+            print_result(result)
+
+    if arguments.output is not None:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as file:
+            print_comparison(json.load(file), report)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--sizes', nargs='+', default=['{}x{}'.format(*size) for size in SIZES],
+                        help='board sizes as ROWSxCOLUMNS')
+    parser.add_argument('--distributions', nargs='+', choices=sorted(DISTRIBUTIONS), default=sorted(DISTRIBUTIONS))
+    parser.add_argument('--count-boards', type=int, default=10, help='count of boards per size and distribution')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='path to the JSON file with results')
+    parser.add_argument('--compare', help='path to the JSON file with results of another commit')
+
+    return parser.parse_args()
+
+
+def parse_sizes(sizes):
+    return [tuple(int(count) for count in size.split('x')) for size in sizes]
+
+
+def get_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def generate_boards_rows(count_rows, count_columns, distribution, count_boards, seed):
+    generator = random.Random('{}-{}x{}-{}'.format(seed, count_rows, count_columns, distribution))
+
+    weights = DISTRIBUTIONS[distribution]
+
+    boards_rows = []
+
+    for _ in range(0, count_boards):
+        rows = [''.join(generator.choices('RGB', weights, k=count_columns)).encode() for _ in range(0, count_rows)]
+
+        boards_rows.append(rows)
+
+    return boards_rows
+
+
+def build_boards(boards_rows, count_rows, count_columns):
+    return [build_board_by_rows(rows, count_rows, count_columns) for rows in boards_rows]
+
+
+def run_benchmark(count_rows, count_columns, distribution, count_boards, seed):
+    boards_rows = generate_boards_rows(count_rows, count_columns, distribution, count_boards, seed)
+
+    result = {
+        'size': '{}x{}'.format(count_rows, count_columns),
+        'distribution': distribution,
+        'count_boards': count_boards,
+        'clusterization_seconds': time_clusterization(build_boards(boards_rows, count_rows, count_columns)),
+        'strategy_seconds': time_strategy(build_boards(boards_rows, count_rows, count_columns)),
+        'compression_seconds': time_compression(build_boards(boards_rows, count_rows, count_columns)),
+    }
+
+    games = [RGBGame(Player(), board, SimpleStrategy(board))
+             for board in build_boards(boards_rows, count_rows, count_columns)]
+
+    start = time.perf_counter()
+
+    for game in games:
+        game.run()
+
+    games_seconds = time.perf_counter() - start
+
+    count_moves = sum(len(game.get_moves()) for game in games)
+
+    result['games_seconds'] = games_seconds
+    result['count_moves'] = count_moves
+    result['games_per_second'] = count_boards / games_seconds
+    result['moves_per_second'] = count_moves / games_seconds
+    result['peak_memory_bytes'] = measure_peak_memory(boards_rows, count_rows, count_columns)
+
+    return result
+
+
+def time_clusterization(boards):
+    start = time.perf_counter()
+
+    for board in boards:
+        ClusterizationAlgorithm(board).build_clusters()
+
+    return time.perf_counter() - start
+
+
+def time_strategy(boards):
+    start = time.perf_counter()
+
+    for board in boards:
+        SimpleStrategy(board).get_best_cluster()
+
+    return time.perf_counter() - start
+
+
+def time_compression(boards):
+    seconds = 0
+
+    for board in boards:
+        cluster = SimpleStrategy(board).get_best_cluster()
+
+        for ball in cluster.get_balls(board):
+            board.remove_ball_on_board(ball)
+
+        compression_algorithm = CompressionAlgorithm(board, cluster, is_vectorized=True)
+
+        start = time.perf_counter()
+
+        compression_algorithm.run()
+
+        seconds += time.perf_counter() - start
+
+    return seconds
+
+
+def measure_peak_memory(boards_rows, count_rows, count_columns):
+    tracemalloc.start()
+
+    for board in build_boards(boards_rows, count_rows, count_columns):
+        RGBGame(Player(), board, SimpleStrategy(board)).run()
+
+    peak = tracemalloc.get_traced_memory()[1]
+
+    tracemalloc.stop()
+
+    return peak
+
+
+def print_result(result):
+    print('{size:>7} {distribution:<10} clusterization {clusterization_seconds:8.4f}s  '
+          'strategy {strategy_seconds:8.4f}s  compression {compression_seconds:8.4f}s  '
+          'games {games_per_second:9.2f}/s  moves {moves_per_second:10.1f}/s  '
+          'peak {peak_memory_bytes:>10} B'.format(**result))
+
+
+def print_comparison(old_report, new_report):
+    old_results = {(result['size'], result['distribution']): result for result in old_report['results']}
+
+    print('\ncompared with {}:'.format(old_report.get('commit')))
+
+    for result in new_report['results']:
+        old_result = old_results.get((result['size'], result['distribution']))
+
+        if old_result is None:
+            continue
+
+        print('{:>7} {:<10} moves/s x{:.2f}  peak memory x{:.2f}'.format(
+            result['size'], result['distribution'], result['moves_per_second'] / old_result['moves_per_second'],
+            result['peak_memory_bytes'] / old_result['peak_memory_bytes']))
+
+
+if __name__ == '__main__':
+    main()
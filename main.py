@@ -1,92 +1,253 @@
-from src.exceptions import CustomException, InvalidCountGamesException, InvalidSeparatorGamesException, \
-    InvalidColorException, InvalidCountBoardColumnsException
-from src.entities import Color, Board, Ball, Point, SimpleStrategy, RGBGame, Player
+import argparse
+import asyncio
+import io
+import itertools
+import multiprocessing
+import sys
+
+from src.exceptions import CustomException, InvalidGameException, InvalidEngineStrategyException
+from src.entities import SimpleStrategy, RGBGame, GameResult, Player
+from src.parser import BoardsParser, build_board_by_rows
+from src.bit_board import build_bit_board_by_rows
+from src.monte_carlo import MonteCarloStrategy
+from src.output import MOVES_WRITERS, DEFAULT_FLUSH_THRESHOLD, TextMovesWriter
+from src.cache import DEFAULT_MAX_MEMORY_BYTES, ResultsCache, calc_game_key
+from src.profiling import Profiler, ProfilesReport
+from src.service import DEFAULT_QUEUE_SIZE, DEFAULT_TIMEOUT, GameService
+
+
+DEFAULT_COUNT_ROWS = 10
+DEFAULT_COUNT_COLUMNS = 15
+
+STRATEGIES = ('simple', 'lookahead', 'montecarlo')
+
+ENGINES = ('objects', 'bits', 'batch')
+
+DEFAULT_BATCH_SIZE = 64
 
 
 def main():
-    boards = build_boards(10, 15)
+    arguments = parse_arguments()
 
-    games = build_games(boards)
+    if arguments.serve:
+        serve(arguments)
 
-    run_games(games)
+        return
 
-    print_games(games)
+    with open_input(arguments.input) as source, open_output(arguments.output) as stream:
+        boards_parser = BoardsParser(source, arguments.rows, arguments.columns, arguments.mmap)
 
+        moves_writer = MOVES_WRITERS[arguments.format](stream, arguments.flush_threshold)
 
-def build_boards(count_rows, count_columns):
-    boards = []
+        results_cache = open_results_cache(arguments)
 
-    count_boards = int(input())
+        try:
+            play(arguments, boards_parser.iterate_boards_rows(), moves_writer, results_cache)
+        finally:
+            moves_writer.close()
 
-    if count_boards < 1:
-        raise InvalidCountGamesException()
+            if results_cache is not None:
+                results_cache.save()
 
-    for number_boards in range(0, count_boards):
-        input_line = input()
 
-        if input_line != '':
-            raise InvalidSeparatorGamesException()
+def play(arguments, boards_rows, moves_writer, results_cache=None):
+    print_games(play_games(arguments, boards_rows, results_cache), moves_writer, arguments.profile)
 
-        rows = []
 
-        for i in range(count_rows, 0, -1):
-            input_line = input()
+def play_games(arguments, boards_rows, results_cache=None):
+    if arguments.engine == 'batch':
+        if arguments.strategy != 'simple':
+            raise InvalidEngineStrategyException(arguments.engine, arguments.strategy)
 
-            row = list(input_line)
+        results = play_batched_games(boards_rows, arguments.batch_size)
 
-            check_valid_count_board_columns(len(row), count_columns)
+        if not arguments.stream:
+            results = list(results)
 
-            row_balls = []
+        return results
 
-            x = 1
-            y = i
+    if results_cache is not None:
+        if arguments.workers > 1:
+            results = play_cached_games_in_parallel(boards_rows, arguments.strategy, results_cache,
+                                                    arguments.workers, arguments.chunk_size, arguments.profile,
+                                                    arguments.engine)
+        else:
+            results = play_cached_games(boards_rows, arguments.strategy, results_cache, arguments.profile,
+                                        arguments.engine, arguments.rollout_workers)
 
-            for color in row:
-                color_enum = build_color_enum(color)
+        if not arguments.stream:
+            results = list(results)
 
-                ball = Ball(Point(x, y), color_enum)
+        return results
 
-                row_balls.append(ball)
+    if arguments.stream:
+        if arguments.workers > 1:
+            return stream_games_in_parallel(boards_rows, arguments.strategy, arguments.workers,
+                                            arguments.chunk_size, arguments.profile, arguments.engine)
 
-                x += 1
+        return stream_games(boards_rows, arguments.strategy, arguments.profile, arguments.engine,
+                            arguments.rollout_workers)
 
-            rows.insert(0, row_balls)
+    if arguments.workers > 1:
+        return run_games_in_parallel(list(boards_rows), arguments.strategy, arguments.workers,
+                                     arguments.chunk_size, arguments.profile, arguments.engine)
 
-        board = Board(rows, count_rows, count_columns)
+    boards = build_boards(boards_rows, arguments.profile, arguments.engine)
 
-        boards.append(board)
+    games = build_games(boards, arguments.strategy, arguments.rollout_workers)
 
-    return boards
+    run_games(games)
 
+    return games
 
-def check_valid_count_board_columns(count_columns, necessary_count_columns):
-    if count_columns != necessary_count_columns:
-        raise InvalidCountBoardColumnsException(count_columns, necessary_count_columns)
 
+def parse_arguments():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('--input', help='path to the input file, stdin by default')
+    parser.add_argument('--mmap', action='store_true', help='memory-map the input instead of reading it in chunks')
+    parser.add_argument('--rows', type=parse_positive_int, default=DEFAULT_COUNT_ROWS,
+                        help='count of board rows for games without a size header')
+    parser.add_argument('--columns', type=parse_positive_int, default=DEFAULT_COUNT_COLUMNS,
+                        help='count of board columns for games without a size header')
+    parser.add_argument('--strategy', choices=STRATEGIES, default='simple', help='strategy of choosing clusters')
+    parser.add_argument('--engine', choices=ENGINES, default='objects',
+                        help='board representation: objects of balls, bitmasks of colors or NumPy batches of boards')
+    parser.add_argument('--batch-size', type=parse_positive_int, default=DEFAULT_BATCH_SIZE,
+                        help='count of boards of the same size played together by the batch engine')
+    parser.add_argument('--workers', type=parse_positive_int, default=1,
+                        help='count of worker processes for playing games')
+    parser.add_argument('--rollout-workers', type=parse_positive_int, default=1,
+                        help='count of worker processes for playouts of the montecarlo strategy without --workers')
+    parser.add_argument('--chunk-size', type=parse_positive_int, default=64,
+                        help='count of games sent to a worker at once')
+    parser.add_argument('--stream', action='store_true', help='play and print games one by one while reading input')
+    parser.add_argument('--output', help='path to the output file, stdout by default')
+    parser.add_argument('--format', choices=sorted(MOVES_WRITERS), default='text', help='format of the moves log')
+    parser.add_argument('--flush-threshold', type=int, default=DEFAULT_FLUSH_THRESHOLD,
+                        help='size of the output buffer in bytes that triggers a write')
+    parser.add_argument('--cache', action='store_true', help='reuse results of games with the same initial board')
+    parser.add_argument('--cache-memory', type=int, default=DEFAULT_MAX_MEMORY_BYTES,
+                        help='memory limit of the results cache in bytes')
+    parser.add_argument('--cache-file', help='path to the file keeping the results cache between runs')
+    parser.add_argument('--serve', action='store_true',
+                        help='run as a service answering framed requests on stdin or on --socket')
+    parser.add_argument('--socket', help='path to the Unix socket of the service')
+    parser.add_argument('--queue-size', type=parse_positive_int, default=DEFAULT_QUEUE_SIZE,
+                        help='count of service requests waiting for a worker before reading stops')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='time limit of a service request in seconds')
+    parser.add_argument('--profile', action='store_true',
+                        help='print time and counters of the game phases per game and in total to stderr')
+
+    return parser.parse_args()
+
+
+def parse_positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+
+    if number < 1:
+        raise argparse.ArgumentTypeError('{} is not a positive integer'.format(value))
+
+    return number
+
+
+def serve(arguments):
+    task_arguments = (arguments.rows, arguments.columns, arguments.strategy, arguments.format, arguments.engine)
+
+    game_service = GameService(play_service_request, task_arguments, arguments.workers, arguments.queue_size,
+                               arguments.timeout)
+
+    if arguments.socket is None:
+        asyncio.run(game_service.serve_stdio())
+    else:
+        asyncio.run(game_service.serve_unix_socket(arguments.socket))
+
+
+def play_service_request(task):
+    payload, count_rows, count_columns, strategy_name, moves_format, engine = task
+
+    stream = io.BytesIO()
+
+    try:
+        boards_parser = BoardsParser(io.BytesIO(payload), count_rows, count_columns)
+
+        if engine == 'batch':
+            if strategy_name != 'simple':
+                raise InvalidEngineStrategyException(engine, strategy_name)
+
+            results = list(play_batched_games(boards_parser.iterate_boards_rows()))
+        else:
+            results = list(stream_games(boards_parser.iterate_boards_rows(), strategy_name, engine=engine))
+    except CustomException as e:
+        return None, e.message
 
-def build_color_enum(color):
-    if color == Color.R.value:
-        return Color.R
-    elif color == Color.G.value:
-        return Color.G
-    elif color == Color.B.value:
-        return Color.B
+    moves_writer = MOVES_WRITERS[moves_format](stream)
 
-    raise InvalidColorException(color)
+    moves_writer.write_games(results)
+    moves_writer.close()
 
+    return stream.getvalue(), None
 
-def build_games(boards):
-    games = []
 
-    for board in boards:
-        player = Player()
-        strategy = SimpleStrategy(board)
+def open_input(path):
+    if path is None:
+        return open(sys.stdin.fileno(), 'rb', closefd=False)
 
-        game = RGBGame(player, board, strategy)
+    return open(path, 'rb')
 
-        games.append(game)
 
-    return games
+def open_output(path):
+    if path is None:
+        return open(sys.stdout.fileno(), 'wb', closefd=False)
+
+    return open(path, 'wb')
+
+
+def open_results_cache(arguments):
+    if not arguments.cache and arguments.cache_file is None:
+        return None
+
+    return ResultsCache(arguments.cache_memory, arguments.cache_file)
+
+
+def build_boards(boards_rows, is_profiled=False, engine='objects'):
+    return [build_board(board_rows, is_profiled, engine) for board_rows in boards_rows]
+
+
+def build_board(board_rows, is_profiled=False, engine='objects'):
+    profiler = Profiler() if is_profiled else None
+
+    if engine == 'bits':
+        return build_bit_board_by_rows(*board_rows, profiler=profiler)
+
+    return build_board_by_rows(*board_rows, profiler=profiler)
+
+
+def build_games(boards, strategy_name='simple', count_rollout_workers=1):
+    return [build_game(board, strategy_name, count_rollout_workers) for board in boards]
+
+
+def build_game(board, strategy_name='simple', count_rollout_workers=1):
+    player = Player()
+    strategy = build_strategy(board, strategy_name, count_rollout_workers)
+
+    return RGBGame(player, board, strategy, board.get_profiler())
+
+
+def build_strategy(board, strategy_name, count_rollout_workers=1):
+    if strategy_name == 'lookahead':
+        from src.strategies import LookaheadStrategy  # requires NumPy
+
+        return LookaheadStrategy(board)
+
+    if strategy_name == 'montecarlo':
+        return MonteCarloStrategy(board, count_workers=count_rollout_workers)
+
+    return SimpleStrategy(board)
 
 
 def run_games(games):
@@ -94,48 +255,176 @@ def run_games(games):
         game.run()
 
 
-def print_games(games):
-    count_games = len(games)
+def run_games_in_parallel(boards_rows, strategy_name, count_workers, chunk_size, is_profiled=False, engine='objects'):
+    tasks = [(board_rows, strategy_name, is_profiled, engine) for board_rows in boards_rows]
+
+    with multiprocessing.Pool(count_workers) as pool:
+        outcomes = pool.imap(play_game, tasks, chunk_size)
+
+        results = []
+
+        for number_games, (result, error_message) in enumerate(outcomes):
+            if error_message is not None:
+                raise InvalidGameException(number_games + 1, error_message)
+
+            results.append(result)
+
+    return results
+
+
+def stream_games(boards_rows, strategy_name, is_profiled=False, engine='objects', count_rollout_workers=1):
+    for board_rows in boards_rows:
+        game = build_game(build_board(board_rows, is_profiled, engine), strategy_name, count_rollout_workers)
+
+        game.run()
+
+        yield game.get_result()
+
 
-    for number_games in range(0, count_games):
-        print('Game {}:'.format(number_games + 1))
+def stream_games_in_parallel(boards_rows, strategy_name, count_workers, chunk_size, is_profiled=False,
+                             engine='objects'):
+    number_games = 0
 
-        print_game(games[number_games])
+    with multiprocessing.Pool(count_workers) as pool:
+        while True:
+            window = list(itertools.islice(boards_rows, count_workers * chunk_size))
 
-        if number_games != count_games - 1:
-            print("\n", end="")
+            if len(window) == 0:
+                return
 
+            tasks = [(board_rows, strategy_name, is_profiled, engine) for board_rows in window]
 
-def print_game(game):
-    for move in game.get_moves():
-        print_move(move)
+            for result, error_message in pool.imap(play_game, tasks, chunk_size):
+                number_games += 1
 
-    print_final_game(game)
+                if error_message is not None:
+                    raise InvalidGameException(number_games, error_message)
 
+                yield result
 
-def print_move(move):
-    number = move.get_number()
 
-    row = move.get_row()
-    column = move.get_column()
+def play_cached_games(boards_rows, strategy_name, results_cache, is_profiled=False, engine='objects',
+                      count_rollout_workers=1):
+    for board_rows in boards_rows:
+        key = calc_game_key(board_rows, strategy_name)
 
-    count_balls_removed = move.get_count_balls_removed()
-    color = move.get_color()
+        result = results_cache.get(key)
 
-    score = move.get_score()
+        if result is None:
+            game = build_game(build_board(board_rows, is_profiled, engine), strategy_name, count_rollout_workers)
+
+            game.run()
+
+            result = game.get_result()
+
+            results_cache.put(key, result)
+
+        yield result
+
+
+def play_cached_games_in_parallel(boards_rows, strategy_name, results_cache, count_workers, chunk_size,
+                                  is_profiled=False, engine='objects'):
+    number_games = 0
+
+    with multiprocessing.Pool(count_workers) as pool:
+        while True:
+            window = list(itertools.islice(boards_rows, count_workers * chunk_size))
+
+            if len(window) == 0:
+                return
+
+            keys = [calc_game_key(board_rows, strategy_name) for board_rows in window]
+
+            results = {}
+            tasks = {}
+
+            for key, board_rows in zip(keys, window):
+                if key in results or key in tasks:
+                    continue
+
+                result = results_cache.get(key)
+
+                if result is None:
+                    tasks[key] = (board_rows, strategy_name, is_profiled, engine)
+                else:
+                    results[key] = result
+
+            error_messages = {}
+
+            for key, (result, error_message) in zip(tasks, pool.imap(play_game, tasks.values(), chunk_size)):
+                if error_message is not None:
+                    error_messages[key] = error_message
+
+                    continue
+
+                results_cache.put(key, result)
+
+                results[key] = result
+
+            for key in keys:
+                number_games += 1
+
+                if key in error_messages:
+                    raise InvalidGameException(number_games, error_messages[key])
+
+                result = results[key]
+
+                yield result
+
+                results[key] = GameResult(result.get_moves(), result.get_player_score(), result.get_balls_remaining())
+
+
+def play_batched_games(boards_rows, batch_size=DEFAULT_BATCH_SIZE):
+    from src.batch_board import BatchBoard, BatchRGBGame, build_batch_cells_by_boards_rows  # requires NumPy
+
+    for batch in iterate_batches(boards_rows, batch_size):
+        game = BatchRGBGame(BatchBoard(build_batch_cells_by_boards_rows(batch)))
+
+        game.run()
+
+        yield from game.get_results()
+
+
+def iterate_batches(boards_rows, batch_size):
+    batch = []
+
+    for board_rows in boards_rows:
+        if len(batch) == batch_size or (len(batch) > 0 and board_rows[1:] != batch[0][1:]):
+            yield batch
+
+            batch = []
+
+        batch.append(board_rows)
+
+    if len(batch) > 0:
+        yield batch
+
+
+def play_game(task):
+    board_rows, strategy_name, is_profiled, engine = task
+
+    try:
+        board = build_board(board_rows, is_profiled, engine)
+
+        game = build_game(board, strategy_name)
+
+        game.run()
+    except CustomException as e:
+        return None, e.message
 
-    str_move = 'Move {} at ({},{}): removed {} balls of color {}, got {} points.'
+    return game.get_result(), None
 
-    str_move = str_move.format(number, row, column, count_balls_removed, color, score)
 
-    print(str_move)
+def print_games(games, moves_writer=None, is_profiled=False):
+    if moves_writer is None:
+        moves_writer = TextMovesWriter(sys.stdout.buffer)
 
+    if is_profiled:
+        games = ProfilesReport(sys.stderr).report_games(games)
 
-def print_final_game(game):
-    player_score = game.get_player_score()
-    balls_remaining = game.get_balls_remaining()
+    moves_writer.write_games(games)
 
-    print('Final score: {}, with {} balls remaining.'.format(player_score, balls_remaining))
+    moves_writer.flush()
 
 
 if __name__ == '__main__':
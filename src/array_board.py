@@ -0,0 +1,167 @@
+import copy
+
+import numpy as np
+from src.entities import EMPTY_CODE, COLOR_CODES, COLORS_BY_CODES, RGBGame, Strategy, Move
+from src.batch_board import BatchClusterizationAlgorithm, BatchCompressionAlgorithm, build_batch_cells_by_boards_rows
+
+
+def build_cells_by_board(board):
+    cells = np.zeros((board.get_count_columns(), board.get_count_rows()), dtype=np.uint8)
+
+    for coordinate_x in range(1, board.get_count_columns() + 1):
+        for coordinate_y in range(1, board.get_count_rows() + 1):
+            ball = board.get_ball_by_coordinates(coordinate_x, coordinate_y)
+
+            if ball is None:
+                continue
+
+            cells[coordinate_x - 1, coordinate_y - 1] = COLOR_CODES[ball.get_color()]
+
+    return cells
+
+
+def build_array_board_by_rows(rows, count_rows, count_columns):  # rows are validated by check_rows, no balls are made
+    return ArrayBoard(build_batch_cells_by_boards_rows([(rows, count_rows, count_columns)])[0])
+
+
+class ArrayRGBGame(RGBGame):
+
+    def __init__(self, player, array_board, strategy):
+        super().__init__(player, array_board, strategy)
+
+    def _build_move(self, cluster):
+        count_balls_removed = cluster.get_count_balls()
+        coordinate_x, coordinate_y = cluster.get_priority_coordinates()
+
+        score_per_move = self._calc_score_per_move(count_balls_removed)
+
+        return Move(self._number_move, coordinate_y, coordinate_x, cluster.get_color().value, count_balls_removed,
+                    score_per_move)
+
+
+class ArrayBoard:
+
+    def __init__(self, cells):
+        self._cells = cells
+        self._count_columns, self._count_rows = cells.shape
+
+        self._balls_remaining = int(np.count_nonzero(cells))
+
+        self._labels = None
+        self._cluster_labels = None
+        self._cluster_sizes = None
+
+        self._init_clusters()
+
+    def fork(self):
+        array_board = copy.copy(self)
+
+        array_board._cells = self._cells.copy()
+
+        return array_board
+
+    def get_cells(self):
+        return self._cells
+
+    def get_count_rows(self):
+        return self._count_rows
+
+    def get_count_columns(self):
+        return self._count_columns
+
+    def get_balls_remaining(self):
+        return self._balls_remaining
+
+    def is_empty(self):
+        return not self._cells.any()
+
+    def has_moves(self):
+        vertical_pairs = (self._cells[:, 1:] == self._cells[:, :-1]) & (self._cells[:, 1:] != EMPTY_CODE)
+        horizontal_pairs = (self._cells[1:, :] == self._cells[:-1, :]) & (self._cells[1:, :] != EMPTY_CODE)
+
+        return bool(vertical_pairs.any() or horizontal_pairs.any())
+
+    def get_labels(self):
+        return self._labels
+
+    def get_cluster_labels(self):
+        return self._cluster_labels
+
+    def get_cluster_sizes(self):
+        return self._cluster_sizes
+
+    def get_clusters(self):
+        return [self.build_cluster(index_cluster) for index_cluster in range(0, len(self._cluster_labels))]
+
+    def build_cluster(self, index_cluster):
+        label = int(self._cluster_labels[index_cluster])
+
+        color_code = int(self._cells.flat[label])
+
+        count_balls = int(self._cluster_sizes[index_cluster])
+
+        return ArrayCluster(label, COLORS_BY_CODES[color_code], count_balls, self._count_rows)
+
+    def _init_clusters(self):  # cells are stored column-major, so the label of a cluster is its priority ball
+        clusterization_algorithm = BatchClusterizationAlgorithm(self._cells[np.newaxis])
+
+        clusterization_algorithm.build_clusters()
+
+        cluster_sizes = clusterization_algorithm.get_cluster_sizes()[0]
+
+        self._labels = clusterization_algorithm.get_labels()[0]
+        self._cluster_labels = np.flatnonzero(cluster_sizes)
+        self._cluster_sizes = cluster_sizes[self._cluster_labels]
+
+    def remove_cluster(self, cluster):
+        removed_cells = self._labels == cluster.get_label()
+
+        self._cells[removed_cells] = EMPTY_CODE
+
+        self._balls_remaining -= cluster.get_count_balls()
+
+        self._compress(cluster, removed_cells)
+
+        self._init_clusters()
+
+    def _compress(self, cluster, removed_cells):
+        compression_algorithm = BatchCompressionAlgorithm(self._cells[np.newaxis], np.array([cluster.get_label()]),
+                                                          removed_cells[np.newaxis])
+
+        compression_algorithm.run()
+
+
+class ArrayCluster:
+
+    def __init__(self, label, color, count_balls, count_rows):
+        self._label = label
+        self._color = color
+        self._count_balls = count_balls
+        self._count_rows = count_rows
+
+    def get_label(self):
+        return self._label
+
+    def get_color(self):
+        return self._color
+
+    def get_count_balls(self):
+        return self._count_balls
+
+    def get_priority_coordinates(self):
+        return self._label // self._count_rows + 1, self._label % self._count_rows + 1
+
+
+class ArraySimpleStrategy(Strategy):
+
+    def __init__(self, array_board):
+        super().__init__(array_board)
+
+    def get_best_cluster(self):
+        cluster_sizes = self._board.get_cluster_sizes()
+
+        if len(cluster_sizes) == 0:
+            return None
+
+        return self._board.build_cluster(int(np.argmax(cluster_sizes)))
+
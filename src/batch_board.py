@@ -0,0 +1,308 @@
+import numpy as np
+
+from src.exceptions import InvalidCountBoardRowsException
+from src.entities import EMPTY_CODE, COLOR_CODES, COLORS_BY_CODES, GameResult, Move
+from src.parser import COLORS_BY_BYTES, check_rows
+
+
+def build_batch_cells_by_boards_rows(boards_rows):
+    _, count_rows, count_columns = boards_rows[0]
+
+    codes = np.zeros(256, dtype=np.uint8)
+
+    for byte, color in enumerate(COLORS_BY_BYTES):
+        if color is not None:
+            codes[byte] = COLOR_CODES[color]
+
+    cells = np.empty((len(boards_rows), count_columns, count_rows), dtype=np.uint8)
+
+    for index_board, (rows, _, _) in enumerate(boards_rows):
+        check_rows(rows, count_columns)
+
+        if len(rows) != count_rows:
+            raise InvalidCountBoardRowsException(len(rows), count_rows)
+
+        board_cells = codes[np.frombuffer(b''.join(reversed(rows)), dtype=np.uint8)].reshape(count_rows, count_columns)
+
+        cells[index_board] = board_cells.T
+
+    return cells
+
+
+class BatchRGBGame:
+
+    def __init__(self, batch_board):
+        self._batch_board = batch_board
+
+        count_boards = batch_board.get_count_boards()
+
+        self._moves = [[] for _ in range(0, count_boards)]
+        self._scores = np.zeros(count_boards, dtype=np.int64)
+        self._balls_remaining = np.zeros(count_boards, dtype=np.int64)
+
+        self._indexes = np.arange(0, count_boards)  # games that are still played, in the order of the batch boards
+
+        self._number_move = 0
+
+    def get_results(self):
+        return [GameResult(moves, int(score), int(balls_remaining))
+                for moves, score, balls_remaining in zip(self._moves, self._scores, self._balls_remaining)]
+
+    def run(self):
+        while len(self._indexes) > 0:
+            priority_indexes, counts_balls = self._batch_board.get_best_clusters()
+
+            is_played = counts_balls >= 2
+
+            if not is_played.all():
+                self._finish_games(~is_played, counts_balls == 0)
+
+                self._batch_board.select_boards(np.flatnonzero(is_played))
+
+                priority_indexes = priority_indexes[is_played]
+                counts_balls = counts_balls[is_played]
+
+                if len(self._indexes) == 0:
+                    break
+
+            self._number_move += 1
+
+            self._record_moves(priority_indexes, counts_balls)
+
+            self._batch_board.remove_clusters(priority_indexes, counts_balls)
+
+    def _finish_games(self, is_finished, is_empty):
+        finished_indexes = self._indexes[is_finished]
+
+        self._scores[self._indexes[is_empty]] += 1000
+
+        self._balls_remaining[finished_indexes] = self._batch_board.get_balls_remaining()[is_finished]
+
+        self._indexes = self._indexes[~is_finished]
+
+    def _record_moves(self, priority_indexes, counts_balls):
+        count_rows = self._batch_board.get_count_rows()
+
+        colors = self._batch_board.get_priority_colors(priority_indexes)
+        scores = self._calc_scores_per_move(counts_balls)
+
+        self._scores[self._indexes] += scores
+
+        for index, priority_index, color_code, count_balls, score in zip(
+                self._indexes.tolist(), priority_indexes.tolist(), colors.tolist(), counts_balls.tolist(),
+                scores.tolist()):
+            self._moves[index].append(Move(self._number_move, priority_index % count_rows + 1,
+                                           priority_index // count_rows + 1, COLORS_BY_CODES[color_code].value,
+                                           count_balls, score))
+
+    def _calc_scores_per_move(self, counts_balls_removed):
+        return (counts_balls_removed - 2) ** 2
+
+
+class BatchBoard:
+
+    def __init__(self, cells):
+        self._cells = cells
+        self._count_boards, self._count_columns, self._count_rows = cells.shape
+
+        self._balls_remaining = np.count_nonzero(cells.reshape(self._count_boards, -1), axis=1)
+
+        self._labels = None
+        self._cluster_sizes = None
+
+        self._init_clusters()
+
+    def get_cells(self):
+        return self._cells
+
+    def get_count_boards(self):
+        return self._count_boards
+
+    def get_count_rows(self):
+        return self._count_rows
+
+    def get_count_columns(self):
+        return self._count_columns
+
+    def get_balls_remaining(self):
+        return self._balls_remaining
+
+    def get_labels(self):
+        return self._labels
+
+    def get_cluster_sizes(self):
+        return self._cluster_sizes
+
+    def get_best_clusters(self):  # cells are stored column-major, so the first largest label is the priority one
+        return self._cluster_sizes.argmax(axis=1), self._cluster_sizes.max(axis=1)
+
+    def get_priority_colors(self, priority_indexes):
+        return self._cells.reshape(self._count_boards, -1)[np.arange(0, self._count_boards), priority_indexes]
+
+    def select_boards(self, indexes):
+        self._cells = self._cells[indexes]
+        self._count_boards = len(indexes)
+
+        self._balls_remaining = self._balls_remaining[indexes]
+
+        self._labels = self._labels[indexes]
+        self._cluster_sizes = self._cluster_sizes[indexes]
+
+    def _init_clusters(self):
+        clusterization_algorithm = BatchClusterizationAlgorithm(self._cells)
+
+        clusterization_algorithm.build_clusters()
+
+        self._labels = clusterization_algorithm.get_labels()
+        self._cluster_sizes = clusterization_algorithm.get_cluster_sizes()
+
+    def remove_clusters(self, priority_indexes, counts_balls):
+        removed_cells = self._labels == priority_indexes[:, None, None]
+
+        self._cells[removed_cells] = EMPTY_CODE
+
+        self._balls_remaining -= counts_balls
+
+        compression_algorithm = BatchCompressionAlgorithm(self._cells, priority_indexes, removed_cells)
+
+        compression_algorithm.run()
+
+        self._init_clusters()
+
+
+class BatchClusterizationAlgorithm:
+
+    def __init__(self, cells):  # ArrayBoard clusters its cells as a batch of one board
+        self._cells = cells
+
+        self._labels = None
+        self._cluster_sizes = None
+
+    def get_labels(self):
+        return self._labels
+
+    def get_cluster_sizes(self):
+        return self._cluster_sizes
+
+    def build_clusters(self):
+        cells = self._cells
+
+        occupied = cells != EMPTY_CODE
+
+        labels = self._propagate_min_labels(cells, occupied)
+
+        count_boards = cells.shape[0]
+
+        self._cluster_sizes = np.bincount(labels[occupied], minlength=cells.size).reshape(count_boards, -1)
+
+        # labels are made local, so they stay valid when finished boards are dropped from the batch
+        self._labels = labels - (np.arange(0, count_boards) * (cells.size // count_boards))[:, None, None]
+
+    def _propagate_min_labels(self, cells, occupied):  # labels never cross boards, the first axis is not propagated
+        count_cells = cells.size
+
+        labels = np.where(occupied, np.arange(0, count_cells).reshape(cells.shape), count_cells)
+
+        same_as_right = occupied[:, :-1] & (cells[:, :-1] == cells[:, 1:])
+        same_as_top = occupied[:, :, :-1] & (cells[:, :, :-1] == cells[:, :, 1:])
+
+        flat_occupied = np.flatnonzero(occupied)
+
+        while True:
+            new_labels = labels.copy()
+
+            np.minimum(new_labels[:, :-1], labels[:, 1:], out=new_labels[:, :-1], where=same_as_right)
+            np.minimum(new_labels[:, 1:], labels[:, :-1], out=new_labels[:, 1:], where=same_as_right)
+            np.minimum(new_labels[:, :, :-1], labels[:, :, 1:], out=new_labels[:, :, :-1], where=same_as_top)
+            np.minimum(new_labels[:, :, 1:], labels[:, :, :-1], out=new_labels[:, :, 1:], where=same_as_top)
+
+            flat_labels = new_labels.reshape(-1)
+
+            flat_labels[flat_occupied] = flat_labels[flat_labels[flat_occupied]]  # pointer jumping
+
+            if np.array_equal(new_labels, labels):
+                return labels
+
+            labels = new_labels
+
+
+class BatchCompressionAlgorithm:
+
+    def __init__(self, cells, priority_indexes, removed_cells):  # ArrayBoard compresses its cells as a batch of one
+        self._cells = cells
+        self._priority_indexes = priority_indexes
+        self._removed_cells = removed_cells
+
+    def run(self):
+        self._compress_vertically()
+        self._compress_horizontally()
+
+    def _compress_vertically(self):
+        cells = self._cells
+
+        indexes_boards, indexes_columns = np.nonzero(self._removed_cells.any(axis=2))
+
+        min_coordinates_y = self._removed_cells[indexes_boards, indexes_columns].argmax(axis=1)
+
+        columns = cells[indexes_boards, indexes_columns]
+
+        shifted_region = np.arange(0, cells.shape[2]) >= min_coordinates_y[:, None]
+        occupied = columns != EMPTY_CODE
+
+        # the top row is never a left border, see Compressor._calc_left_border_shift_range
+        is_shifted_columns = (shifted_region[:, :-1] & occupied[:, :-1]).any(axis=1)
+
+        keys = np.where(shifted_region, np.where(occupied, 0, 1), -1)
+        keys[~is_shifted_columns] = -1
+
+        order = np.argsort(keys, axis=1, kind='stable')
+
+        cells[indexes_boards, indexes_columns] = np.take_along_axis(columns, order, axis=1)
+
+    def _compress_horizontally(self):
+        cells = self._cells
+
+        _, count_columns, count_rows = cells.shape
+
+        bottom_occupied = cells[:, :, 0] != EMPTY_CODE
+
+        first_start_columns = self._find_first_start_columns(bottom_occupied)
+
+        if (first_start_columns < 0).all():
+            return
+
+        shifted_columns = bottom_occupied & (np.arange(0, count_columns) > first_start_columns[:, None])
+        shifted_columns[first_start_columns < 0] = False
+
+        # the last column is never a left border, see Compressor._calc_left_border_shift_range
+        if count_columns > 1:
+            shifted_columns[:, -1] &= bottom_occupied[:, -2]
+
+        indexes_boards, sources = np.nonzero(shifted_columns)
+
+        ranks = np.cumsum(shifted_columns, axis=1) - 1
+
+        targets = first_start_columns[indexes_boards] + ranks[indexes_boards, sources]
+
+        source_columns = cells[indexes_boards, sources]
+        occupied = source_columns != EMPTY_CODE
+
+        heights = np.where(occupied.all(axis=1), count_rows, occupied.argmin(axis=1))
+
+        segments = np.arange(0, count_rows) < heights[:, None]
+
+        cells[indexes_boards, sources] = np.where(segments, EMPTY_CODE, source_columns)
+        cells[indexes_boards, targets] = np.where(segments, source_columns, cells[indexes_boards, targets])
+
+    def _find_first_start_columns(self, bottom_occupied):
+        _, count_columns, count_rows = self._cells.shape
+
+        min_coordinates_x = self._priority_indexes // count_rows
+
+        start_columns = np.zeros(bottom_occupied.shape, dtype=bool)
+        start_columns[:, 1:-1] = bottom_occupied[:, :-2] & ~bottom_occupied[:, 1:-1]
+        start_columns &= np.arange(0, count_columns) >= np.maximum(min_coordinates_x, 1)[:, None]
+
+        first_start_columns = np.where(start_columns.any(axis=1), start_columns.argmax(axis=1), -1)
+
+        return np.where((min_coordinates_x == 0) & ~bottom_occupied[:, 0], 0, first_start_columns)
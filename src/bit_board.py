@@ -0,0 +1,405 @@
+import copy
+
+from src.exceptions import InvalidCountBoardRowsException
+from src.entities import COLOR_CODES, COLORS_BY_CODES, Ball, Point
+from src.parser import COLORS_BY_BYTES, check_rows
+from src.profiling import NullProfiler
+
+
+def build_bit_board_by_rows(rows, count_rows, count_columns, profiler=None):
+    check_rows(rows, count_columns)
+
+    if len(rows) != count_rows:
+        raise InvalidCountBoardRowsException(len(rows), count_rows)
+
+    column_height = count_rows + 1
+
+    masks = [0] * (len(COLOR_CODES) + 1)
+
+    for index_y, row in zip(range(count_rows - 1, -1, -1), rows):
+        for index_x, code in enumerate(row):
+            masks[COLOR_CODES[COLORS_BY_BYTES[code]]] |= 1 << (index_x * column_height + index_y)
+
+    return BitBoard(masks, count_rows, count_columns, profiler)
+
+
+def build_bit_board_by_board(board):
+    column_height = board.get_count_rows() + 1
+
+    masks = [0] * (len(COLOR_CODES) + 1)
+
+    for coordinate_x in range(1, board.get_count_columns() + 1):
+        for coordinate_y in range(1, board.get_count_rows() + 1):
+            ball = board.get_ball_by_coordinates(coordinate_x, coordinate_y)
+
+            if ball is None:
+                continue
+
+            masks[COLOR_CODES[ball.get_color()]] |= 1 << ((coordinate_x - 1) * column_height + coordinate_y - 1)
+
+    return BitBoard(masks, board.get_count_rows(), board.get_count_columns())
+
+
+class BitBoard:
+
+    def __init__(self, masks, count_rows, count_columns, profiler=None):
+        self._masks = masks
+        self._count_rows = count_rows
+        self._count_columns = count_columns
+
+        self._column_height = count_rows + 1  # the top bit of every column stays empty, so shifts never wrap
+        self._column_mask = (1 << count_rows) - 1
+        self._bottom_mask = sum(1 << (index_x * self._column_height) for index_x in range(0, count_columns))
+
+        self._balls_remaining = sum(mask.bit_count() for mask in masks)
+
+        self._profiler = profiler if profiler is not None else NullProfiler()
+
+        self._clusters = None
+        self._best_cluster = None
+
+    def fork(self):
+        bit_board = copy.copy(self)
+
+        bit_board._masks = list(self._masks)
+
+        return bit_board
+
+    def get_masks(self):
+        return self._masks
+
+    def get_count_rows(self):
+        return self._count_rows
+
+    def get_count_columns(self):
+        return self._count_columns
+
+    def get_balls_remaining(self):
+        return self._balls_remaining
+
+    def get_profiler(self):
+        return self._profiler
+
+    def get_ball_by_coordinates(self, coordinate_x, coordinate_y):
+        bit = 1 << ((coordinate_x - 1) * self._column_height + coordinate_y - 1)
+
+        for color_code in range(1, len(self._masks)):
+            if self._masks[color_code] & bit:
+                return Ball(Point(coordinate_x, coordinate_y), COLORS_BY_CODES[color_code])
+
+        return None
+
+    def is_empty(self):
+        return not any(self._masks)
+
+    def has_moves(self):
+        return any(mask & ((mask << 1) | (mask << self._column_height)) for mask in self._masks)
+
+    def get_clusters(self):
+        if self._clusters is None:
+            self._init_clusters()
+
+        return self._clusters
+
+    def get_best_cluster(self):
+        if self._best_cluster is None:
+            self._find_best_cluster()
+
+        return self._best_cluster
+
+    def _init_clusters(self):
+        start = self._profiler.start()
+
+        self._clusters = []
+
+        for color_code in range(1, len(self._masks)):
+            remaining_mask = self._masks[color_code]
+
+            while remaining_mask:
+                seed = remaining_mask & -remaining_mask
+
+                cluster_mask = self._fill(seed, remaining_mask)
+
+                remaining_mask &= ~cluster_mask
+
+                self._clusters.append(BitCluster(cluster_mask, COLORS_BY_CODES[color_code], seed.bit_length() - 1,
+                                                 self._column_height))
+
+        self._profiler.stop('init_clusters', start)
+
+        self._profiler.add_count('clusters_built', len(self._clusters))
+
+    def _find_best_cluster(self):
+        start = self._profiler.start()
+
+        best_mask = 0
+        best_color_code = 0
+        best_count_balls = 1
+        best_index = 0
+
+        count_clusters = 0
+
+        for color_code in range(1, len(self._masks)):
+            color_mask = self._masks[color_code]
+
+            remaining_mask = color_mask & self._spread(color_mask)  # only balls with a neighbour of the same color
+
+            count_clusters += (color_mask & ~remaining_mask).bit_count()
+
+            while remaining_mask:
+                seed = remaining_mask & -remaining_mask
+
+                cluster_mask = self._fill(seed, remaining_mask)
+
+                remaining_mask &= ~cluster_mask
+
+                count_clusters += 1
+
+                count_balls = cluster_mask.bit_count()
+                index = seed.bit_length() - 1
+
+                # bits go column by column, so a lower index is the priority ball
+                if count_balls > best_count_balls or (count_balls == best_count_balls and index < best_index):
+                    best_mask, best_color_code = cluster_mask, color_code
+                    best_count_balls, best_index = count_balls, index
+
+        if best_mask == 0:
+            self._find_best_single_ball()
+        else:
+            self._best_cluster = BitCluster(best_mask, COLORS_BY_CODES[best_color_code], best_index,
+                                            self._column_height)
+
+        self._profiler.stop('init_clusters', start)
+
+        self._profiler.add_count('clusters_built', count_clusters)
+
+    def _find_best_single_ball(self):
+        occupied = self._masks[1] | self._masks[2] | self._masks[3]
+
+        if occupied == 0:
+            return
+
+        seed = occupied & -occupied
+
+        for color_code in range(1, len(self._masks)):
+            if self._masks[color_code] & seed:
+                self._best_cluster = BitCluster(seed, COLORS_BY_CODES[color_code], seed.bit_length() - 1,
+                                                self._column_height)
+
+    def _spread(self, mask):
+        return (mask << 1) | (mask >> 1) | (mask << self._column_height) | (mask >> self._column_height)
+
+    def _fill(self, cluster_mask, color_mask):
+        column_height = self._column_height
+
+        while True:
+            grown_mask = (cluster_mask | (cluster_mask << 1) | (cluster_mask >> 1) | (cluster_mask << column_height) |
+                          (cluster_mask >> column_height)) & color_mask
+
+            if grown_mask == cluster_mask:
+                return cluster_mask
+
+            cluster_mask = grown_mask
+
+    def remove_cluster(self, cluster):
+        start = self._profiler.start()
+
+        color_code = COLOR_CODES[cluster.get_color()]
+
+        self._masks[color_code] &= ~cluster.get_mask()
+
+        self._balls_remaining -= cluster.get_count_balls()
+
+        self._profiler.stop('remove_cluster', start)
+
+        self._compress(cluster)
+
+        self._clusters = None
+        self._best_cluster = None
+
+    def _compress(self, cluster):
+        start = self._profiler.start()
+
+        compression_algorithm = BitCompressionAlgorithm(self, cluster)
+
+        compression_algorithm.run()
+
+        self._profiler.stop('compression', start)
+
+        self._profiler.add_count('balls_shifted', compression_algorithm.get_count_balls_shifted())
+
+    def get_column_height(self):
+        return self._column_height
+
+    def get_column_mask(self):
+        return self._column_mask
+
+    def get_bottom_mask(self):
+        return self._bottom_mask
+
+
+class BitCluster:
+
+    __slots__ = ('_mask', '_color', '_count_balls', '_priority_index', '_column_height')
+
+    def __init__(self, mask, color, priority_index, column_height):
+        self._mask = mask
+        self._color = color
+        self._count_balls = mask.bit_count()
+        self._priority_index = priority_index
+        self._column_height = column_height
+
+    def get_mask(self):
+        return self._mask
+
+    def get_color(self):
+        return self._color
+
+    def get_count_balls(self):
+        return self._count_balls
+
+    def get_priority_index(self):
+        return self._priority_index
+
+    def get_priority_coordinates(self):
+        return self._priority_index // self._column_height + 1, self._priority_index % self._column_height + 1
+
+    def get_priority_ball(self):
+        return Ball(Point(*self.get_priority_coordinates()), self._color)
+
+
+class BitCompressionAlgorithm:
+
+    def __init__(self, bit_board, cluster):
+        self._bit_board = bit_board
+        self._cluster = cluster
+
+        self._masks = bit_board.get_masks()
+
+        self._column_height = bit_board.get_column_height()
+        self._column_mask = bit_board.get_column_mask()
+
+        self._count_balls_shifted = 0
+
+    def get_count_balls_shifted(self):
+        return self._count_balls_shifted
+
+    def run(self):
+        self._compress_vertically()
+        self._compress_horizontally()
+
+    def _compress_vertically(self):
+        removed_mask = self._cluster.get_mask()
+
+        while removed_mask:
+            index_bit = (removed_mask & -removed_mask).bit_length() - 1
+
+            index_x, min_index_y = divmod(index_bit, self._column_height)
+
+            self._drop_column(index_x, min_index_y)
+
+            removed_mask &= ~(self._column_mask << (index_x * self._column_height))
+
+    def _drop_column(self, index_x, min_index_y):
+        shift = index_x * self._column_height
+
+        columns = [(mask >> shift) & self._column_mask for mask in self._masks]
+
+        occupied = columns[1] | columns[2] | columns[3]
+
+        shifted_mask = self._column_mask & ~((1 << min_index_y) - 1)
+
+        # the top row is never a left border, see Compressor._calc_left_border_shift_range
+        if occupied & shifted_mask & (self._column_mask >> 1) == 0:
+            return
+
+        holes = ~occupied & shifted_mask
+
+        if occupied >= holes & -holes:
+            self._count_balls_shifted += (occupied & ~((holes & -holes) - 1)).bit_count()
+
+        while holes:
+            hole = holes & -holes
+
+            if occupied < hole:
+                break
+
+            lower_mask = hole - 1
+
+            columns = [(column & lower_mask) | ((column >> 1) & ~lower_mask) for column in columns]
+
+            occupied = (occupied & lower_mask) | ((occupied >> 1) & ~lower_mask)
+
+            holes = ~occupied & self._column_mask & ~lower_mask
+
+        cleared_mask = ~(self._column_mask << shift)
+
+        for color_code in range(1, len(self._masks)):
+            self._masks[color_code] = (self._masks[color_code] & cleared_mask) | (columns[color_code] << shift)
+
+    def _compress_horizontally(self):
+        count_columns = self._bit_board.get_count_columns()
+
+        occupied = self._masks[1] | self._masks[2] | self._masks[3]
+
+        bottom_occupied = [bool((occupied >> (index_x * self._column_height)) & 1)
+                           for index_x in range(0, count_columns)]
+
+        first_start_column = self._find_first_start_column(bottom_occupied)
+
+        if first_start_column is None:
+            return
+
+        sources = [index_x for index_x in range(first_start_column + 1, count_columns) if bottom_occupied[index_x]]
+
+        # the last column is never a left border, see Compressor._calc_left_border_shift_range
+        if count_columns > 1 and not bottom_occupied[count_columns - 2] and count_columns - 1 in sources:
+            sources.pop()
+
+        segments = [self._pop_segment(source, occupied) for source in sources]
+
+        for target, segment in enumerate(segments, first_start_column):
+            self._put_segment(target, segment)
+
+    def _find_first_start_column(self, bottom_occupied):
+        min_index_x = self._cluster.get_priority_index() // self._column_height
+
+        if min_index_x == 0:
+            if not bottom_occupied[0]:
+                return 0
+
+            min_index_x = 1
+
+        for index_x in range(min_index_x, len(bottom_occupied) - 1):
+            if bottom_occupied[index_x - 1] and not bottom_occupied[index_x]:
+                return index_x
+
+        return None
+
+    def _pop_segment(self, index_x, occupied):
+        shift = index_x * self._column_height
+
+        column = (occupied >> shift) & self._column_mask
+
+        segment_mask = (column + 1) & ~column  # the lowest empty cell, above the bottom-contiguous segment
+
+        segment_mask -= 1
+
+        segment = [(mask >> shift) & segment_mask for mask in self._masks]
+
+        for color_code in range(1, len(self._masks)):
+            self._masks[color_code] &= ~(segment_mask << shift)
+
+        self._count_balls_shifted += segment_mask.bit_count()
+
+        return segment_mask, segment
+
+    def _put_segment(self, index_x, segment):
+        segment_mask, columns = segment
+
+        shift = index_x * self._column_height
+
+        cleared_mask = ~(segment_mask << shift)
+
+        for color_code in range(1, len(self._masks)):
+            self._masks[color_code] = (self._masks[color_code] & cleared_mask) | (columns[color_code] << shift)
@@ -0,0 +1,123 @@
+import collections
+import hashlib
+import os
+import pickle
+import sys
+
+from src.exceptions import InvalidCacheFileException
+from src.entities import GameResult
+
+
+CACHE_VERSION = 2
+
+DEFAULT_MAX_MEMORY_BYTES = 64 << 20
+
+
+def calc_game_key(board_rows, strategy_name):
+    rows, count_rows, count_columns = board_rows
+
+    hasher = hashlib.blake2b(digest_size=16)
+
+    hasher.update(b'%d %d %s\n' % (count_rows, count_columns, strategy_name.encode()))
+
+    for row in rows:
+        hasher.update(row)
+        hasher.update(b'\n')
+
+    return hasher.digest()
+
+
+class ResultsCache:
+
+    def __init__(self, max_memory_bytes=DEFAULT_MAX_MEMORY_BYTES, path=None):
+        self._max_memory_bytes = max_memory_bytes
+        self._path = path
+
+        self._entries = collections.OrderedDict()
+
+        self._memory_bytes = 0
+
+        self._count_hits = 0
+        self._count_misses = 0
+
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def get_memory_bytes(self):
+        return self._memory_bytes
+
+    def get_count_entries(self):
+        return len(self._entries)
+
+    def get_count_hits(self):
+        return self._count_hits
+
+    def get_count_misses(self):
+        return self._count_misses
+
+    def get(self, key):
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self._count_misses += 1
+
+            return None
+
+        self._count_hits += 1
+
+        self._entries.move_to_end(key)
+
+        return pickle.loads(entry)
+
+    def put(self, key, result):
+        result = GameResult(result.get_moves(), result.get_player_score(), result.get_balls_remaining())
+
+        self._put_entry(key, pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+
+    def _put_entry(self, key, entry):
+        entry_memory_bytes = self._calc_entry_memory_bytes(key, entry)
+
+        if entry_memory_bytes > self._max_memory_bytes:
+            return
+
+        if key in self._entries:
+            self._remove_entry(key)
+
+        self._entries[key] = entry
+
+        self._memory_bytes += entry_memory_bytes
+
+        while self._memory_bytes > self._max_memory_bytes:
+            self._remove_entry(next(iter(self._entries)))
+
+    def _remove_entry(self, key):
+        entry = self._entries.pop(key)
+
+        self._memory_bytes -= self._calc_entry_memory_bytes(key, entry)
+
+    def _calc_entry_memory_bytes(self, key, entry):
+        return sys.getsizeof(key) + sys.getsizeof(entry)
+
+    def save(self):
+        if self._path is None:
+            return
+
+        temporary_path = self._path + '.tmp'
+
+        with open(temporary_path, 'wb') as file:
+            pickle.dump((CACHE_VERSION, list(self._entries.items())), file, pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporary_path, self._path)
+
+    def _load(self):
+        try:
+            with open(self._path, 'rb') as file:
+                version, entries = pickle.load(file)
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            raise InvalidCacheFileException(self._path)
+
+        if version != CACHE_VERSION:
+            return
+
+        for key, entry in entries:
+            self._put_entry(key, entry)
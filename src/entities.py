@@ -1,7 +1,12 @@
+import array
+import copy
 import enum
+import functools
+import heapq
 from abc import ABCMeta, abstractmethod
 from src.exceptions import InvalidCountBoardRowsException, InvalidCountBoardColumnsException, \
-    InvalidBallColorClusterException
+    InvalidBallColorClusterException, InvalidMoveNumberException, GameHistoryNotRecordedException
+from src.profiling import NullProfiler
 
 
 class Color(enum.Enum):
@@ -11,17 +16,31 @@ class Color(enum.Enum):
     B = 'B'
 
 
+EMPTY_CODE = 0
+
+COLOR_CODES = {Color.R: 1, Color.G: 2, Color.B: 3}
+
+COLORS_BY_CODES = {code: color for color, code in COLOR_CODES.items()}
+
+
 class RGBGame:
 
-    def __init__(self, player, board, strategy):
+    def __init__(self, player, board, strategy, profiler=None, is_history_recorded=False):
         self._player = player
         self._board = board
         self._strategy = strategy
 
+        self._profiler = profiler if profiler is not None else NullProfiler()
+
+        self._is_history_recorded = is_history_recorded
+
         self._moves = []
+        self._board_deltas = []
 
         self._number_move = 0
 
+        self._player_bonus = 0
+
     def get_moves(self):
         return self._moves
 
@@ -31,32 +50,54 @@ class RGBGame:
     def get_balls_remaining(self):
         return self._board.get_balls_remaining()
 
+    def get_profiler(self):
+        return self._profiler
+
+    def get_number_move(self):
+        return self._number_move
+
+    def get_result(self):
+        return GameResult(self._moves, self.get_player_score(), self.get_balls_remaining(), self._profiler)
+
     def run(self):
         while True:
-            best_cluster = self._get_best_cluster()
-
-            if best_cluster is None:
+            if self._board.is_empty():
                 self._add_player_bonus()
 
                 break
 
-            if best_cluster.get_count_balls() < 2:
+            if not self._board.has_moves():  # no two adjacent balls of one color, so every cluster is a single ball
                 break
 
+            best_cluster = self._get_best_cluster()
+
             self._move(best_cluster)
 
             self._remove_cluster(best_cluster)
 
     def _get_best_cluster(self):
-        return self._strategy.get_best_cluster()
+        start = self._profiler.start()
+
+        best_cluster = self._strategy.get_best_cluster()
+
+        self._profiler.stop('strategy', start)
+
+        return best_cluster
 
     def _add_player_bonus(self):
-        self._add_player_score(1000)
+        self._add_player_score(1000 - self._player_bonus)
+
+        self._player_bonus = 1000
 
     def _add_player_score(self, score):
         self._player.add_score(score)
 
     def _move(self, cluster):
+        del self._moves[self._number_move:]
+        del self._board_deltas[self._number_move:]
+
+        self._player_bonus = 0
+
         self._number_move += 1
 
         move = self._build_move(cluster)
@@ -71,15 +112,94 @@ class RGBGame:
         count_balls_removed = cluster.get_count_balls()
         priority_ball = cluster.get_priority_ball()
 
+        point = priority_ball.get_point()
+
         score_per_move = self._calc_score_per_move(count_balls_removed)
 
-        return Move(self._number_move, priority_ball, count_balls_removed, score_per_move)
+        return Move(self._number_move, point.get_coordinate_y(), point.get_coordinate_x(),
+                    priority_ball.get_color().value, count_balls_removed, score_per_move)
 
     def _calc_score_per_move(self, count_balls_removed):
         return pow(count_balls_removed - 2, 2)
 
     def _remove_cluster(self, cluster):
-        self._board.remove_cluster(cluster)
+        if not self._is_history_recorded:
+            self._board.remove_cluster(cluster)
+
+            return
+
+        self._board_deltas.append(self._board.remove_cluster_with_delta(cluster))
+
+    def undo(self):
+        self._check_history_recorded()
+
+        if self._number_move == 0:
+            return False
+
+        if self._number_move == len(self._board_deltas):
+            self._add_player_score(-self._player_bonus)
+
+        self._number_move -= 1
+
+        self._board.revert_delta(self._board_deltas[self._number_move])
+
+        self._add_player_score(-self._moves[self._number_move].get_score())
+
+        return True
+
+    def redo(self):
+        self._check_history_recorded()
+
+        if self._number_move == len(self._board_deltas):
+            return False
+
+        self._board.apply_delta(self._board_deltas[self._number_move])
+
+        self._add_player_score(self._moves[self._number_move].get_score())
+
+        self._number_move += 1
+
+        if self._number_move == len(self._board_deltas):
+            self._add_player_score(self._player_bonus)
+
+        return True
+
+    def rewind(self, number_move):
+        self._check_history_recorded()
+
+        if number_move < 0 or number_move > len(self._board_deltas):
+            raise InvalidMoveNumberException(number_move, len(self._board_deltas))
+
+        while self._number_move > number_move:
+            self.undo()
+
+        while self._number_move < number_move:
+            self.redo()
+
+    def _check_history_recorded(self):
+        if not self._is_history_recorded:
+            raise GameHistoryNotRecordedException()
+
+
+class GameResult:
+
+    def __init__(self, moves, player_score, balls_remaining, profiler=None):
+        self._moves = moves
+        self._player_score = player_score
+        self._balls_remaining = balls_remaining
+        self._profiler = profiler
+
+    def get_moves(self):
+        return self._moves
+
+    def get_player_score(self):
+        return self._player_score
+
+    def get_balls_remaining(self):
+        return self._balls_remaining
+
+    def get_profiler(self):
+        return self._profiler
 
 
 class Player:
@@ -94,18 +214,68 @@ class Player:
         self._score += score
 
 
+NEIGHBOURS_STRIDE = 4  # left, right, lower and upper neighbour of a cell
+NO_NEIGHBOUR = -1
+
+
+@functools.lru_cache(maxsize=8)
+def build_neighbour_indexes(count_rows, count_columns):  # by the indexes of Board.calc_index_by_coordinates
+    count_cells = count_rows * count_columns
+    row_stride = NEIGHBOURS_STRIDE * count_columns
+
+    neighbour_indexes = array.array('i', [NO_NEIGHBOUR]) * (count_cells * NEIGHBOURS_STRIDE)
+
+    neighbour_indexes[0::NEIGHBOURS_STRIDE] = array.array('i', range(-1, count_cells - 1))
+    neighbour_indexes[0::row_stride] = array.array('i', [NO_NEIGHBOUR]) * count_rows
+
+    neighbour_indexes[1::NEIGHBOURS_STRIDE] = array.array('i', range(1, count_cells + 1))
+    neighbour_indexes[row_stride - NEIGHBOURS_STRIDE + 1::row_stride] = array.array('i', [NO_NEIGHBOUR]) * count_rows
+
+    neighbour_indexes[row_stride + 2::NEIGHBOURS_STRIDE] = array.array('i', range(0, count_cells - count_columns))
+    neighbour_indexes[3:(count_cells - count_columns) * NEIGHBOURS_STRIDE:NEIGHBOURS_STRIDE] = \
+        array.array('i', range(count_columns, count_cells))
+
+    return neighbour_indexes
+
+
 class Board:
 
-    def __init__(self, balls, count_rows, count_columns):
+    def __init__(self, balls, count_rows, count_columns, is_incremental_clusterization=True,
+                 is_vectorized_compression=True, profiler=None):
         self._check_size(balls, count_rows, count_columns)
 
-        self._balls = balls
+        self._columns = [[row[x] for row in balls] for x in range(0, count_columns)]
+        self._owned_columns = [True] * count_columns
+
         self._count_rows = count_rows
         self._count_columns = count_columns
 
         self._balls_remaining = sum(len(x) for x in balls)
 
-        self._clusters = []
+        self._is_incremental_clusterization = is_incremental_clusterization
+        self._is_vectorized_compression = is_vectorized_compression
+
+        self._profiler = profiler if profiler is not None else NullProfiler()
+
+        self._board_delta = None
+
+        self._neighbour_indexes = build_neighbour_indexes(count_rows, count_columns)
+
+        self._count_balls = 0  # balls lost by HorizontallyCompressor are not in balls_remaining, so they are counted
+        self._count_pairs = 0
+        self._count_balls_by_columns = [0] * count_columns
+        self._count_pairs_by_columns = [0] * count_columns  # pairs inside a column and with the next column
+        self._heights_by_columns = [0] * count_columns  # balls lying from the bottom without a gap
+        self._changed_columns = set(range(1, count_columns + 1))
+
+        self._clusters = {}
+        self._clusters_heap = []
+        self._is_clusters_owned = True
+
+        self._clusters_by_columns = [[None] * count_rows for _ in range(0, count_columns)]  # the cluster of each cell
+        self._owned_clusters_columns = [True] * count_columns
+
+        self._is_clusters_stale = False
 
         self._init_clusters()
 
@@ -121,6 +291,29 @@ class Board:
             if count_columns != necessary_count_columns:
                 raise InvalidCountBoardColumnsException(count_columns, necessary_count_columns)
 
+    def fork(self):  # columns, clusters and their heap are shared and copied on the first write by either board
+        board = copy.copy(self)
+
+        board._columns = list(self._columns)
+
+        board._owned_columns = [False] * self._count_columns
+        self._owned_columns = [False] * self._count_columns
+
+        board._count_balls_by_columns = list(self._count_balls_by_columns)
+        board._count_pairs_by_columns = list(self._count_pairs_by_columns)
+        board._heights_by_columns = list(self._heights_by_columns)
+        board._changed_columns = set(self._changed_columns)
+
+        board._clusters_by_columns = list(self._clusters_by_columns)
+
+        board._owned_clusters_columns = [False] * self._count_columns
+        self._owned_clusters_columns = [False] * self._count_columns
+
+        board._is_clusters_owned = False
+        self._is_clusters_owned = False
+
+        return board
+
     def get_count_rows(self):
         return self._count_rows
 
@@ -130,59 +323,434 @@ class Board:
     def get_balls_remaining(self):
         return self._balls_remaining
 
+    def get_profiler(self):
+        return self._profiler
+
     def get_clusters(self):
-        return self._clusters
+        self._if_need_init_clusters()
+
+        return self._clusters.values()
+
+    def get_best_cluster(self):
+        self._if_need_init_clusters()
+
+        while len(self._clusters_heap) > 0:
+            cluster = self._clusters_heap[0][-1]
+
+            if self._clusters.get(id(cluster)) is cluster:
+                return cluster
+
+            self._get_writable_clusters()
+
+            heapq.heappop(self._clusters_heap)  # lazy deletion of removed and rebuilt clusters
+
+        return None
+
+    def is_empty(self):
+        if len(self._changed_columns) > 0:
+            self._recount_columns()
+
+        return self._count_balls == 0
+
+    def has_moves(self):
+        if len(self._changed_columns) > 0:
+            self._recount_columns()
+
+        return self._count_pairs > 0
+
+    def get_column_height(self, coordinate_x):
+        if coordinate_x in self._changed_columns:
+            self._recount_columns()
+
+        return self._heights_by_columns[coordinate_x - 1]
+
+    def _recount_columns(self):
+        for coordinate_x in self._changed_columns:
+            count_balls, count_pairs, height = self._count_column(coordinate_x)
+
+            self._count_balls += count_balls - self._count_balls_by_columns[coordinate_x - 1]
+            self._count_pairs += count_pairs - self._count_pairs_by_columns[coordinate_x - 1]
+
+            self._count_balls_by_columns[coordinate_x - 1] = count_balls
+            self._count_pairs_by_columns[coordinate_x - 1] = count_pairs
+            self._heights_by_columns[coordinate_x - 1] = height
+
+        self._changed_columns = set()
+
+    def _count_column(self, coordinate_x):
+        column = self._columns[coordinate_x - 1]
+        next_column = self._columns[coordinate_x] if coordinate_x < self._count_columns else None
+
+        count_balls = 0
+        count_pairs = 0
+
+        height = self._count_rows
+
+        for index_y, ball in enumerate(column):
+            if ball is None:
+                height = min(height, index_y)
+
+                continue
+
+            count_balls += 1
+
+            upper_ball = column[index_y + 1] if index_y + 1 < self._count_rows else None
+
+            if upper_ball is not None and ball.is_equal_by_color(upper_ball):
+                count_pairs += 1
+
+            if next_column is None or next_column[index_y] is None:
+                continue
+
+            if ball.is_equal_by_color(next_column[index_y]):
+                count_pairs += 1
+
+        return count_balls, count_pairs, height
+
+    def _mark_changed_column(self, coordinate_x):
+        self._changed_columns.add(coordinate_x)
+
+        if coordinate_x > 1:
+            self._changed_columns.add(coordinate_x - 1)
+
+    def _if_need_init_clusters(self):
+        if self._is_clusters_stale:
+            self._is_clusters_stale = False
+
+            self._init_clusters()
+
+    def _if_need_compact_clusters_heap(self):
+        if len(self._clusters_heap) > 2 * len(self._clusters) + 64:
+            self._init_clusters_heap()
+
+    def _push_cluster(self, cluster):
+        self._get_writable_clusters()
+
+        heapq.heappush(self._clusters_heap, self._build_cluster_heap_entry(cluster))
+
+    def _build_cluster_heap_entry(self, cluster):
+        point = cluster.get_priority_ball().get_point()
+
+        return -cluster.get_count_balls(), point.get_coordinate_x(), point.get_coordinate_y(), id(cluster), cluster
+
+    def _init_clusters_heap(self):
+        self._clusters_heap = [self._build_cluster_heap_entry(cluster) for cluster in self._clusters.values()]
+
+        heapq.heapify(self._clusters_heap)
+
+    def calc_index_by_coordinates(self, coordinate_x, coordinate_y):
+        return (coordinate_y - 1) * self._count_columns + coordinate_x - 1
+
+    def get_neighbour_indexes(self, index):
+        start = index * NEIGHBOURS_STRIDE
+
+        return [index_neighbour for index_neighbour in self._neighbour_indexes[start:start + NEIGHBOURS_STRIDE]
+                if index_neighbour != NO_NEIGHBOUR]
 
     def _init_clusters(self):
+        start = self._profiler.start()
+
         clusterization_algorithm = ClusterizationAlgorithm(self)
 
-        self._clusters = clusterization_algorithm.build_clusters()
+        self._clusters = {id(cluster): cluster for cluster in clusterization_algorithm.build_clusters()}
+
+        self._init_clusters_heap()
+
+        self._is_clusters_owned = True
+
+        self._clusters_by_columns = clusterization_algorithm.get_clusters_by_columns()
+        self._owned_clusters_columns = [True] * self._count_columns
+
+        self._profiler.stop('init_clusters', start)
+
+        self._profiler.add_count('clusters_built', len(self._clusters))
+        self._profiler.add_count('merges_attempted', clusterization_algorithm.get_count_unions())
+
+    def find_cluster_balls(self, cluster):  # the cells of a live cluster are marked in _clusters_by_columns
+        point = cluster.get_priority_ball().get_point()
+
+        stack = [self.calc_index_by_coordinates(point.get_coordinate_x(), point.get_coordinate_y())]
+
+        visited_indexes = {stack[0]}
+
+        balls = []
+
+        while len(stack) > 0:
+            index = stack.pop()
+
+            balls.append(self.get_ball_by_index(index))
+
+            for index_neighbour in self.get_neighbour_indexes(index):
+                if index_neighbour in visited_indexes or self.get_cluster_by_index(index_neighbour) is not cluster:
+                    continue
+
+                visited_indexes.add(index_neighbour)
+
+                stack.append(index_neighbour)
+
+        return balls
 
     def remove_cluster(self, cluster):
         self._remove_cluster_on_board(cluster)
 
+        if not self._is_incremental_clusterization:
+            self._compress(cluster)
+
+            if not self._if_need_skip_clusters_update():
+                self._init_clusters()
+
+            return
+
+        clusterization_algorithm = IncrementalClusterizationAlgorithm(self, cluster)
+
+        clusterization_algorithm.release_dirty_region()
+
         self._compress(cluster)
 
-        self._init_clusters()
+        if self._if_need_skip_clusters_update():
+            return
+
+        start = self._profiler.start()
+
+        new_clusters = clusterization_algorithm.update_clusters(self._get_writable_clusters())
+
+        for new_cluster in new_clusters:
+            self._push_cluster(new_cluster)
+
+        self._if_need_compact_clusters_heap()
+
+        self._profiler.stop('update_clusters', start)
+
+        self._profiler.add_count('clusters_built', len(new_clusters))
+        self._profiler.add_count('merges_attempted', clusterization_algorithm.get_count_unions())
+
+    def _if_need_skip_clusters_update(self):  # a dead board is left as it is, its clusters are built only if asked
+        if self._board_delta is not None or self.has_moves():
+            return False
+
+        self._is_clusters_stale = True
+
+        return True
+
+    def remove_cluster_with_delta(self, cluster):
+        clusters = dict(self._clusters)
+
+        if not self._is_incremental_clusterization:  # every cluster is rebuilt, so undo needs the balls of all of them
+            for old_cluster in clusters.values():
+                old_cluster.get_balls(self)
+
+        self._board_delta = BoardDelta(self._balls_remaining)
+
+        self._owned_columns = [False] * self._count_columns  # the first write to every column is recorded
+
+        self.remove_cluster(cluster)
+
+        board_delta = self._board_delta
+
+        self._board_delta = None
+
+        board_delta.finish(self._balls_remaining, self._columns, clusters, self._clusters)
+
+        for coordinate_x in board_delta.get_old_columns():
+            self._owned_columns[coordinate_x - 1] = False
+
+        return board_delta
+
+    def revert_delta(self, board_delta):
+        self._restore_state(board_delta.get_old_columns(), board_delta.get_balls_remaining_before(),
+                            board_delta.get_added_clusters(), board_delta.get_removed_clusters())
+
+    def apply_delta(self, board_delta):
+        self._restore_state(board_delta.get_new_columns(), board_delta.get_balls_remaining_after(),
+                            board_delta.get_removed_clusters(), board_delta.get_added_clusters())
+
+    def _restore_state(self, columns, balls_remaining, dropped_clusters, restored_clusters):
+        clusters = self._get_writable_clusters()
+
+        for cluster in dropped_clusters:  # before the columns change, lazy clusters still find their balls
+            del clusters[id(cluster)]
+
+            self._set_cluster_by_index(cluster, None)
+
+        for coordinate_x, column in columns.items():
+            self._columns[coordinate_x - 1] = column
+            self._owned_columns[coordinate_x - 1] = False
+
+            self._mark_changed_column(coordinate_x)
+
+        self._balls_remaining = balls_remaining
+
+        for cluster in restored_clusters:
+            clusters[id(cluster)] = cluster
+
+            self._set_cluster_by_index(cluster, cluster)
+
+            self._push_cluster(cluster)
+
+        self._if_need_compact_clusters_heap()
+
+    def _set_cluster_by_index(self, cluster, value):
+        for ball in cluster.get_balls(self):
+            point = ball.get_point()
+
+            self._get_writable_clusters_column(point.get_coordinate_x())[point.get_coordinate_y() - 1] = value
+
+    def get_cluster_by_index(self, index):
+        index_y, index_x = divmod(index, self._count_columns)
+
+        return self._clusters_by_columns[index_x][index_y]
+
+    def set_cluster_by_index(self, index, cluster):
+        index_y, index_x = divmod(index, self._count_columns)
+
+        self._get_writable_clusters_column(index_x + 1)[index_y] = cluster
+
+    def get_clusters_column(self, coordinate_x, min_coordinate_y):
+        return self._clusters_by_columns[coordinate_x - 1][min_coordinate_y - 1:]
+
+    def release_clusters_column(self, coordinate_x, min_coordinate_y):
+        column = self._get_writable_clusters_column(coordinate_x)
+
+        column[min_coordinate_y - 1:] = [None] * (self._count_rows - min_coordinate_y + 1)
+
+    def _get_writable_clusters_column(self, coordinate_x):
+        if not self._owned_clusters_columns[coordinate_x - 1]:
+            self._clusters_by_columns[coordinate_x - 1] = list(self._clusters_by_columns[coordinate_x - 1])
+            self._owned_clusters_columns[coordinate_x - 1] = True
+
+        return self._clusters_by_columns[coordinate_x - 1]
+
+    def _get_writable_clusters(self):
+        if not self._is_clusters_owned:
+            self._clusters = dict(self._clusters)
+            self._clusters_heap = list(self._clusters_heap)
+            self._is_clusters_owned = True
+
+        return self._clusters
 
     def _remove_cluster_on_board(self, cluster):
-        count_balls = cluster.get_count_balls()
+        start = self._profiler.start()
 
-        for index_ball in range(0, count_balls):
-            ball = cluster[index_ball]
+        count_balls = cluster.get_count_balls()
 
+        for ball in cluster.get_balls(self):
             self.remove_ball_on_board(ball)
 
         self._balls_remaining -= count_balls
 
+        self._profiler.stop('remove_cluster', start)
+
     def remove_ball_on_board(self, ball):
         ball_coordinate_x = ball.get_point().get_coordinate_x()
         ball_coordinate_y = ball.get_point().get_coordinate_y()
 
-        self._balls[ball_coordinate_y - 1][ball_coordinate_x - 1] = None
+        self._get_writable_column(ball_coordinate_x)[ball_coordinate_y - 1] = None
 
     def _compress(self, cluster):
-        compression_algorithm = CompressionAlgorithm(self, cluster)
+        start = self._profiler.start()
+
+        compression_algorithm = CompressionAlgorithm(self, cluster, self._is_vectorized_compression)
 
         compression_algorithm.run()
 
+        self._profiler.stop('compression', start)
+
+        self._profiler.add_count('balls_shifted', compression_algorithm.get_count_balls_shifted())
+
     def is_located_ball(self, point):
         coordinate_x = point.get_coordinate_x()
         coordinate_y = point.get_coordinate_y()
 
-        return self._balls[coordinate_y - 1][coordinate_x - 1] is not None
+        return self._columns[coordinate_x - 1][coordinate_y - 1] is not None
 
     def get_ball_by_point(self, point):
         coordinate_x = point.get_coordinate_x()
         coordinate_y = point.get_coordinate_y()
 
-        return self._balls[coordinate_y - 1][coordinate_x - 1]
+        return self.get_ball_by_coordinates(coordinate_x, coordinate_y)
+
+    def get_ball_by_coordinates(self, coordinate_x, coordinate_y):
+        return self._columns[coordinate_x - 1][coordinate_y - 1]
+
+    def get_ball_by_index(self, index):
+        index_y, index_x = divmod(index, self._count_columns)
+
+        return self._columns[index_x][index_y]
 
     def set_ball_on_board(self, ball, point):
         coordinate_x = point.get_coordinate_x()
         coordinate_y = point.get_coordinate_y()
 
-        self._balls[coordinate_y - 1][coordinate_x - 1] = ball
+        self._get_writable_column(coordinate_x)[coordinate_y - 1] = ball
+
+    def get_column(self, coordinate_x):
+        return list(self._columns[coordinate_x - 1])
+
+    def set_column(self, coordinate_x, column):
+        if self._board_delta is not None:
+            self._board_delta.record_old_column(coordinate_x, self._columns[coordinate_x - 1])
+
+        self._columns[coordinate_x - 1] = list(column)
+        self._owned_columns[coordinate_x - 1] = True
+
+        self._mark_changed_column(coordinate_x)
+
+    def _get_writable_column(self, coordinate_x):
+        self._mark_changed_column(coordinate_x)
+
+        if not self._owned_columns[coordinate_x - 1]:
+            if self._board_delta is not None:
+                self._board_delta.record_old_column(coordinate_x, self._columns[coordinate_x - 1])
+
+            self._columns[coordinate_x - 1] = list(self._columns[coordinate_x - 1])
+            self._owned_columns[coordinate_x - 1] = True
+
+        return self._columns[coordinate_x - 1]
+
+
+class BoardDelta:
+
+    def __init__(self, balls_remaining_before):
+        self._balls_remaining_before = balls_remaining_before
+        self._balls_remaining_after = balls_remaining_before
+
+        self._old_columns = {}
+        self._new_columns = {}
+
+        self._removed_clusters = []
+        self._added_clusters = []
+
+    def get_balls_remaining_before(self):
+        return self._balls_remaining_before
+
+    def get_balls_remaining_after(self):
+        return self._balls_remaining_after
+
+    def get_old_columns(self):
+        return self._old_columns
+
+    def get_new_columns(self):
+        return self._new_columns
+
+    def get_removed_clusters(self):
+        return self._removed_clusters
+
+    def get_added_clusters(self):
+        return self._added_clusters
+
+    def record_old_column(self, coordinate_x, column):
+        if coordinate_x not in self._old_columns:
+            self._old_columns[coordinate_x] = column
+
+    def finish(self, balls_remaining_after, columns, old_clusters, new_clusters):
+        self._balls_remaining_after = balls_remaining_after
+
+        self._new_columns = {coordinate_x: columns[coordinate_x - 1] for coordinate_x in self._old_columns}
+
+        self._removed_clusters = [cluster for id_cluster, cluster in old_clusters.items()
+                                  if id_cluster not in new_clusters]
+        self._added_clusters = [cluster for id_cluster, cluster in new_clusters.items()
+                                if id_cluster not in old_clusters]
 
 
 class ClusterizationAlgorithm:
@@ -190,119 +758,364 @@ class ClusterizationAlgorithm:
     def __init__(self, board):
         self._board = board
 
-        self._clusters = []
+        self._disjoint_set = None
+
+        self._clusters_by_columns = None
 
-        self._index_merged_at_least_once_clusters = []
+    def get_count_unions(self):
+        return self._disjoint_set.get_count_unions()
+
+    def get_clusters_by_columns(self):
+        return self._clusters_by_columns
 
     def build_clusters(self):
-        self._clusters = []
+        count_rows = self._board.get_count_rows()
+        count_columns = self._board.get_count_columns()
+
+        self._disjoint_set = DisjointSet(count_rows * count_columns)
 
-        for y in range(1, self._board.get_count_rows() + 1):
-            for x in range(1, self._board.get_count_columns() + 1):
-                point = Point(x, y)
+        self._clusters_by_columns = [[None] * count_rows for _ in range(0, count_columns)]
 
-                ball = self._board.get_ball_by_point(point)
+        indexed_balls = []
+
+        for y in range(1, count_rows + 1):
+            for x in range(1, count_columns + 1):
+                ball = self._board.get_ball_by_coordinates(x, y)
 
                 if ball is None:
                     continue
 
-                cluster = self._build_cluster_for_ball(ball)
+                index_ball = self._calc_index_ball(x, y)
 
-                self._clusters.append(cluster)
+                self._union_with_neighbour(ball, index_ball, x - 1, y, index_ball - 1)
+                self._union_with_neighbour(ball, index_ball, x, y - 1, index_ball - count_columns)
 
-                self._union_clusters()
+                indexed_balls.append((index_ball, x, y, ball))
 
-        return self._clusters
+        return self._build_clusters_by_roots(indexed_balls)
 
-    def _build_cluster_for_ball(self, ball):
-        cluster = Cluster(ball.get_color())
-        cluster.add_ball(ball)
+    def _calc_index_ball(self, coordinate_x, coordinate_y):
+        return (coordinate_y - 1) * self._board.get_count_columns() + coordinate_x - 1
 
-        return cluster
+    def _union_with_neighbour(self, ball, index_ball, coordinate_x, coordinate_y, index_neighbour):
+        if coordinate_x < 1 or coordinate_y < 1:
+            return
+
+        neighbour = self._board.get_ball_by_coordinates(coordinate_x, coordinate_y)
 
-    def _union_clusters(self):
-        union_clusters = []
+        if neighbour is None or not ball.is_equal_by_color(neighbour):
+            return
 
-        self._index_merged_at_least_once_clusters = []
+        self._disjoint_set.union(index_ball, index_neighbour)
 
-        for index_cluster, cluster in enumerate(self._clusters):
-            if index_cluster in self._index_merged_at_least_once_clusters:
-                continue
+    def _build_clusters_by_roots(self, indexed_balls):
+        clusters_by_roots = {}
+
+        for index_ball, coordinate_x, coordinate_y, ball in indexed_balls:
+            root = self._disjoint_set.find(index_ball)
+
+            cluster = clusters_by_roots.get(root)
+
+            if cluster is None:
+                cluster = LazyCluster(ball.get_color(), self._board)
+
+                clusters_by_roots[root] = cluster
+
+            cluster.add_ball(ball)
+
+            self._clusters_by_columns[coordinate_x - 1][coordinate_y - 1] = cluster
+
+        return list(clusters_by_roots.values())
 
-            self._index_merged_at_least_once_clusters.append(index_cluster)
 
-            self._merge_cluster_with_all_possible(cluster)
+class IncrementalClusterizationAlgorithm:
 
-            union_clusters.append(cluster)
+    def __init__(self, board, removed_cluster):
+        self._board = board
+        self._removed_cluster = removed_cluster
+
+        self._dirty_region = None
 
-        self._clusters = union_clusters
+        self._invalid_clusters = {}
 
-    def _merge_cluster_with_all_possible(self, cluster):
-        is_merged_at_least_once_clusters = False
+        self._disjoint_set = None
 
-        is_first_step = True
-        while is_first_step or is_merged_at_least_once_clusters:  # do while
-            is_first_step = False
+    def get_count_unions(self):
+        return self._disjoint_set.get_count_unions()
 
-            is_merged_at_least_once_clusters = False
+    def release_dirty_region(self):
+        self._dirty_region = self._build_dirty_region()
 
-            for index_other_cluster, other_cluster in enumerate(self._clusters):
-                if index_other_cluster in self._index_merged_at_least_once_clusters:
+        for coordinate_x, min_coordinate_y in self._dirty_region.get_columns():
+            for cluster in self._board.get_clusters_column(coordinate_x, min_coordinate_y):
+                if cluster is None or id(cluster) in self._invalid_clusters:
                     continue
 
-                if not other_cluster.can_belong(cluster):
+                cluster.get_balls(self._board)  # the clean balls are collected after the compression
+
+                self._invalid_clusters[id(cluster)] = cluster
+
+        for coordinate_x, min_coordinate_y in self._dirty_region.get_columns():  # lazy clusters find balls until here
+            self._board.release_clusters_column(coordinate_x, min_coordinate_y)
+
+    def _build_dirty_region(self):
+        min_coordinates_y_by_columns = {}
+
+        for ball in self._removed_cluster.get_balls(self._board):
+            point = ball.get_point()
+
+            coordinate_x = point.get_coordinate_x()
+            coordinate_y = point.get_coordinate_y()
+
+            min_coordinate_y = min_coordinates_y_by_columns.get(coordinate_x, coordinate_y)
+
+            min_coordinates_y_by_columns[coordinate_x] = min(min_coordinate_y, coordinate_y)
+
+        first_shifted_column = self._find_first_shifted_column(min(min_coordinates_y_by_columns))
+
+        return DirtyRegion(min_coordinates_y_by_columns, first_shifted_column, self._board.get_count_columns())
+
+    def _find_first_shifted_column(self, min_coordinate_x):  # HorizontallyCompressor looks only at y = 1
+        for coordinate_x in range(min_coordinate_x, self._board.get_count_columns() + 1):
+            if self._board.get_column_height(coordinate_x) == 0:
+                return coordinate_x
+
+        return None
+
+    def update_clusters(self, clusters):
+        indexed_balls = self._collect_dirty_balls()
+
+        self._expand_by_boundary(indexed_balls)
+
+        for id_cluster in self._invalid_clusters:
+            del clusters[id_cluster]
+
+        new_clusters = self._build_clusters_for_balls(indexed_balls)
+
+        for cluster in new_clusters:
+            clusters[id(cluster)] = cluster
+
+        return new_clusters
+
+    def _collect_dirty_balls(self):
+        indexed_balls = {}
+
+        for coordinate_x, min_coordinate_y in self._dirty_region.get_columns():
+            for coordinate_y in range(min_coordinate_y, self._board.get_count_rows() + 1):
+                ball = self._board.get_ball_by_coordinates(coordinate_x, coordinate_y)
+
+                if ball is None:
                     continue
 
-                cluster.merge(other_cluster)
+                indexed_balls[self._board.calc_index_by_coordinates(coordinate_x, coordinate_y)] = ball
+
+        for cluster in self._invalid_clusters.values():
+            if cluster is self._removed_cluster:
+                continue
+
+            self._collect_clean_balls(cluster, indexed_balls)
+
+        return indexed_balls
+
+    def _collect_clean_balls(self, cluster, indexed_balls):
+        clean_indexes = []
+
+        for ball in cluster.get_balls(self._board):
+            coordinate_x = ball.get_point().get_coordinate_x()
+            coordinate_y = ball.get_point().get_coordinate_y()
+
+            if self._dirty_region.is_dirty(coordinate_x, coordinate_y):
+                continue
+
+            index = self._board.calc_index_by_coordinates(coordinate_x, coordinate_y)
+
+            indexed_balls[index] = ball
+
+            clean_indexes.append(index)
+
+        return clean_indexes
+
+    def _expand_by_boundary(self, indexed_balls):
+        queue = list(indexed_balls)
+
+        while len(queue) > 0:
+            index = queue.pop()
+
+            for index_neighbour in self._get_neighbour_indexes_by_color(index, indexed_balls[index]):
+                if index_neighbour in indexed_balls:
+                    continue
+
+                cluster = self._board.get_cluster_by_index(index_neighbour)
+
+                self._invalid_clusters[id(cluster)] = cluster
+
+                queue.extend(self._collect_clean_balls(cluster, indexed_balls))
+
+    def _get_neighbour_indexes_by_color(self, index, ball):
+        neighbour_indexes = []
+
+        for index_neighbour in self._board.get_neighbour_indexes(index):
+            neighbour = self._board.get_ball_by_index(index_neighbour)
+
+            if neighbour is not None and ball.is_equal_by_color(neighbour):
+                neighbour_indexes.append(index_neighbour)
+
+        return neighbour_indexes
+
+    def _build_clusters_for_balls(self, indexed_balls):
+        local_indexes = {index: local_index for local_index, index in enumerate(indexed_balls)}
+
+        self._disjoint_set = DisjointSet(len(local_indexes))
+
+        for index, ball in indexed_balls.items():
+            for index_neighbour in self._get_neighbour_indexes_by_color(index, ball):
+                self._disjoint_set.union(local_indexes[index], local_indexes[index_neighbour])
+
+        clusters_by_roots = {}
+
+        for index, ball in indexed_balls.items():
+            root = self._disjoint_set.find(local_indexes[index])
+
+            cluster = clusters_by_roots.get(root)
+
+            if cluster is None:
+                cluster = LazyCluster(ball.get_color(), self._board)
+
+                clusters_by_roots[root] = cluster
+
+            cluster.add_ball(ball)
+
+            self._board.set_cluster_by_index(index, cluster)
+
+        return list(clusters_by_roots.values())
+
+
+class DirtyRegion:
+
+    def __init__(self, min_coordinates_y_by_columns, first_shifted_column, count_columns):
+        self._min_coordinates_y_by_columns = min_coordinates_y_by_columns
+        self._first_shifted_column = first_shifted_column
+        self._count_columns = count_columns
+
+    def is_dirty(self, coordinate_x, coordinate_y):
+        if self._first_shifted_column is not None and coordinate_x >= self._first_shifted_column:
+            return True
+
+        min_coordinate_y = self._min_coordinates_y_by_columns.get(coordinate_x)
+
+        return min_coordinate_y is not None and coordinate_y >= min_coordinate_y
+
+    def get_columns(self):
+        columns = []
+
+        for coordinate_x in sorted(self._min_coordinates_y_by_columns):
+            if self._first_shifted_column is not None and coordinate_x >= self._first_shifted_column:
+                break
+
+            columns.append((coordinate_x, self._min_coordinates_y_by_columns[coordinate_x]))
+
+        if self._first_shifted_column is not None:
+            for coordinate_x in range(self._first_shifted_column, self._count_columns + 1):
+                columns.append((coordinate_x, 1))
+
+        return columns
+
+
+class DisjointSet:
+
+    def __init__(self, count_elements):
+        self._parents = list(range(0, count_elements))
+        self._ranks = [0] * count_elements
+
+        self._count_unions = 0
+
+    def get_count_unions(self):
+        return self._count_unions
+
+    def find(self, element):
+        root = element
+
+        while self._parents[root] != root:
+            root = self._parents[root]
 
-                self._index_merged_at_least_once_clusters.append(index_other_cluster)
+        while self._parents[element] != root:  # path compression
+            next_element = self._parents[element]
 
-                is_merged_at_least_once_clusters = True
+            self._parents[element] = root
+
+            element = next_element
+
+        return root
+
+    def union(self, element, other_element):
+        self._count_unions += 1
+
+        root = self.find(element)
+        other_root = self.find(other_element)
+
+        if root == other_root:
+            return False
+
+        if self._ranks[root] < self._ranks[other_root]:
+            root, other_root = other_root, root
+
+        self._parents[other_root] = root
+
+        if self._ranks[root] == self._ranks[other_root]:
+            self._ranks[root] += 1
+
+        return True
 
 
 class Cluster:
 
+    __slots__ = ('_color', '_color_code', '_balls', '_points', '_count_balls', '_priority_ball')
+
     def __init__(self, color):
         self._color = color
+        self._color_code = COLOR_CODES[color]
 
         self._balls = []
+        self._points = set()
         self._count_balls = 0
 
-        self._index_priority_ball = -1
+        self._priority_ball = None
 
     def __getitem__(self, item):
-        return self._balls[item]
+        return self.get_balls()[item]
+
+    def get_balls(self, board=None):
+        return self._balls
+
+    def _get_points(self):
+        return self._points
 
     def get_color(self):
         return self._color
 
+    def get_color_code(self):
+        return self._color_code
+
     def add_ball(self, ball):
         if not self._is_suit_by_color(ball):
             raise InvalidBallColorClusterException(ball.get_color().value, self._color.value)
 
         self._balls.append(ball)
+        self._get_points().add(ball.get_point())
 
         self._count_balls += 1
 
-        self._if_need_set_index_priority_ball(self._count_balls - 1)
+        self._if_need_set_priority_ball(ball)
 
     def _is_suit_by_color(self, ball):
-        return ball.get_color().value == self._color.value
+        return ball.get_color_code() == self._color_code
 
-    def _if_need_set_index_priority_ball(self, index_ball):
-        if self._index_priority_ball == -1:
-            self._index_priority_ball = index_ball
-
-            return
-
-        priority_ball = self._balls[self._index_priority_ball]
-        ball = self._balls[index_ball]
-
-        if ball.is_priority(priority_ball):
-            self._index_priority_ball = index_ball
+    def _if_need_set_priority_ball(self, ball):
+        if self._priority_ball is None or ball.is_priority(self._priority_ball):
+            self._priority_ball = ball
 
     def get_priority_ball(self):
-        return self._balls[self._index_priority_ball]
+        return self._priority_ball
 
     def get_count_balls(self):
         return self._count_balls
@@ -311,42 +1124,113 @@ class Cluster:
         if not self.is_equal_by_color(other_cluster):
             return False
 
-        for index_other_cluster_ball in range(0, other_cluster.get_count_balls()):
-            other_cluster_ball = other_cluster[index_other_cluster_ball]
+        if other_cluster.get_count_balls() > self._count_balls:
+            return other_cluster.can_belong(self)
+
+        points = self._get_points()
+
+        for other_cluster_ball in other_cluster.get_balls():
+            point = other_cluster_ball.get_point()
 
-            for cluster_ball in self._balls:
-                if other_cluster_ball.is_nearby(cluster_ball):
+            coordinate_x = point.get_coordinate_x()
+            coordinate_y = point.get_coordinate_y()
+
+            for neighbour_point in (Point(coordinate_x - 1, coordinate_y), Point(coordinate_x + 1, coordinate_y),
+                                    Point(coordinate_x, coordinate_y - 1), Point(coordinate_x, coordinate_y + 1)):
+                if neighbour_point in points:
                     return True
 
         return False
 
     def is_equal_by_color(self, other_cluster):
-        return self._color.value == other_cluster.get_color().value
+        return self._color_code == other_cluster.get_color_code()
+
+    def merge(self, other_cluster):  # only the balls of the smaller cluster are added one by one
+        if not self.is_equal_by_color(other_cluster):
+            raise InvalidBallColorClusterException(other_cluster.get_color().value, self._color.value)
+
+        if other_cluster.get_count_balls() > self._count_balls:
+            self._copy_balls(other_cluster)
 
-    def merge(self, other_cluster):
-        for index_other_cluster_ball in range(0, other_cluster.get_count_balls()):
-            other_cluster_ball = other_cluster[index_other_cluster_ball]
+            return
+
+        self._add_missing_balls(other_cluster.get_balls())
+
+    def _copy_balls(self, other_cluster):  # other_cluster is copied and the own balls are added to the copy
+        own_balls = self.get_balls()
+
+        self._balls = list(other_cluster.get_balls())
+        self._points = set(other_cluster._get_points())
+        self._count_balls = other_cluster.get_count_balls()
 
-            if self.is_exist_ball(other_cluster_ball):
+        self._priority_ball = other_cluster.get_priority_ball()
+
+        self._add_missing_balls(own_balls)
+
+    def _add_missing_balls(self, balls):
+        for ball in balls:
+            if self.is_exist_ball(ball):
                 continue
 
-            self.add_ball(other_cluster_ball)
+            self.add_ball(ball)
 
     def is_exist_ball(self, ball):
-        for index_cluster_ball in range(0, self.get_count_balls()):
-            cluster_ball = self[index_cluster_ball]
+        return self._is_suit_by_color(ball) and ball.get_point() in self._get_points()
 
-            if ball.is_equal(cluster_ball):
-                return True
 
-        return False
+class LazyCluster(Cluster):
+
+    __slots__ = ('_board',)
+
+    def __init__(self, color, board):  # Cluster.__init__ is skipped, the lists are built on the first request
+        self._color = color
+        self._color_code = COLOR_CODES[color]
+
+        self._balls = None
+        self._points = None
+        self._count_balls = 0
+
+        self._priority_ball = None
+
+        self._board = board
+
+    def get_balls(self, board=None):  # the board must still hold the cluster when the balls are asked the first time
+        if self._balls is None:
+            if board is None:
+                board = self._board
+
+            self._balls = [self._priority_ball] if self._count_balls == 1 else board.find_cluster_balls(self)
+
+        return self._balls
+
+    def _get_points(self):
+        if self._points is None:
+            self._points = {ball.get_point() for ball in self.get_balls()}
+
+        return self._points
+
+    def add_ball(self, ball):
+        if self._balls is not None:
+            super().add_ball(ball)
+
+            return
+
+        if not self._is_suit_by_color(ball):
+            raise InvalidBallColorClusterException(ball.get_color().value, self._color.value)
+
+        self._count_balls += 1
+
+        self._if_need_set_priority_ball(ball)
 
 
 class Ball:
 
+    __slots__ = ('_point', '_color', '_color_code')
+
     def __init__(self, point, color):
         self._point = point
         self._color = color
+        self._color_code = COLOR_CODES[color]
 
     def get_point(self):
         return self._point
@@ -354,6 +1238,9 @@ class Ball:
     def get_color(self):
         return self._color
 
+    def get_color_code(self):
+        return self._color_code
+
     def is_priority(self, ball):
         if self._point.get_coordinate_x() > ball.get_point().get_coordinate_x():
             return False
@@ -373,76 +1260,90 @@ class Ball:
         return self._point.is_equal(ball.get_point())
 
     def is_equal_by_color(self, ball):
-        return self._color.value == ball.get_color().value
+        return self._color_code == ball.get_color_code()
 
     def shift_left_horizontally(self, offset):
         new_coordinate_x = self._point.get_coordinate_x() - offset
 
-        self._point.set_coordinate_x(new_coordinate_x)
+        return Ball(Point(new_coordinate_x, self._point.get_coordinate_y()), self._color)
 
     def shift_bottom_vertically(self, offset):
         new_coordinate_y = self._point.get_coordinate_y() - offset
 
-        self._point.set_coordinate_y(new_coordinate_y)
+        return Ball(Point(self._point.get_coordinate_x(), new_coordinate_y), self._color)
 
     def is_nearby(self, other_ball):
-        ball_coordinate_x = self._point.get_coordinate_x()
-        ball_coordinate_y = self._point.get_coordinate_y()
-
-        other_ball_coordinate_x = other_ball.get_point().get_coordinate_x()
-        other_ball_coordinate_y = other_ball.get_point().get_coordinate_y()
-
-        if ball_coordinate_x == other_ball_coordinate_x and abs(ball_coordinate_y - other_ball_coordinate_y) == 1:
-            return True
+        other_point = other_ball.get_point()
 
-        if ball_coordinate_y == other_ball_coordinate_y and abs(ball_coordinate_x - other_ball_coordinate_x) == 1:
-            return True
+        offset_x = abs(self._point.get_coordinate_x() - other_point.get_coordinate_x())
+        offset_y = abs(self._point.get_coordinate_y() - other_point.get_coordinate_y())
 
-        return False
+        return offset_x + offset_y == 1
 
 
 class Point:
 
+    __slots__ = ('_coordinate_x', '_coordinate_y')
+
     def __init__(self, coordinate_x, coordinate_y):
         self._coordinate_x = coordinate_x
         self._coordinate_y = coordinate_y
 
+    def __eq__(self, other):
+        if not isinstance(other, Point):
+            return NotImplemented
+
+        return self.is_equal(other)
+
+    def __hash__(self):
+        return hash((self._coordinate_x, self._coordinate_y))
+
     def get_coordinate_x(self):
         return self._coordinate_x
 
     def get_coordinate_y(self):
         return self._coordinate_y
 
-    def set_coordinate_x(self, coordinate_x):
-        self._coordinate_x = coordinate_x
-
-    def set_coordinate_y(self, coordinate_y):
-        self._coordinate_y = coordinate_y
-
     def is_equal(self, point):
         return self._coordinate_x == point.get_coordinate_x() and self._coordinate_y == point.get_coordinate_y()
 
 
 class CompressionAlgorithm:
 
-    def __init__(self, board, cluster):
+    def __init__(self, board, cluster, is_vectorized=False):
         self._board = board
         self._cluster = cluster
+        self._is_vectorized = is_vectorized
+
+        self._count_balls_shifted = 0
+
+    def get_count_balls_shifted(self):
+        return self._count_balls_shifted
 
     def run(self):
         self._compress_vertically()
         self._compress_horizontally()
 
     def _compress_vertically(self):
-        vertically_compressor = VerticallyCompressor(self._board, self._cluster)
+        if self._is_vectorized:
+            vertically_compressor = VectorizedVerticallyCompressor(self._board, self._cluster)
+        else:
+            vertically_compressor = VerticallyCompressor(self._board, self._cluster)
 
         vertically_compressor.run()
 
+        self._count_balls_shifted += vertically_compressor.get_count_balls_shifted()
+
     def _compress_horizontally(self):
-        horizontally_compressor = HorizontallyCompressor(self._board, self._cluster)
+        if self._is_vectorized:
+            horizontally_compressor = VectorizedHorizontallyCompressor(self._board, self._cluster)
+        else:
+            horizontally_compressor = HorizontallyCompressor(self._board, self._cluster)
 
         horizontally_compressor.run()
 
+        self._count_balls_shifted += horizontally_compressor.get_count_balls_shifted()
+
 
 class Compressor:
 
@@ -454,6 +1355,11 @@ class Compressor:
 
         self._accumulative_offset = 0
 
+        self._count_balls_shifted = 0
+
+    def get_count_balls_shifted(self):
+        return self._count_balls_shifted
+
     def run(self):
         start_points = self._get_start_points_in_empty_ranges()
 
@@ -498,13 +1404,14 @@ class Compressor:
 
         max_parametric_coordinate = self._get_max_parametric_coordinate()
 
+        # the last row or column is never taken as the left border of a shift range, so VerticallyCompressor leaves
+        # a column whose shifted balls all lie in the top row, and HorizontallyCompressor does not move the last
+        # column after an empty one; the vectorized, bit and batch compressors keep these board states
         for parametric_coordinate in range(start_parametric_coordinate, max_parametric_coordinate + 1):
             if parametric_coordinate == max_parametric_coordinate:
                 return None
 
-            parametric_point = self._build_parametric_point(parametric_coordinate, fixed_coordinate)
-
-            if self._board.is_located_ball(parametric_point):
+            if self._is_located_ball(parametric_coordinate, fixed_coordinate):
                 return parametric_coordinate
 
         return None
@@ -516,9 +1423,7 @@ class Compressor:
         max_parametric_coordinate = self._get_max_parametric_coordinate()
 
         for parametric_coordinate in range(start_parametric_coordinate + 1, max_parametric_coordinate + 1):
-            parametric_point = self._build_parametric_point(parametric_coordinate, fixed_coordinate)
-
-            if not self._board.is_located_ball(parametric_point):
+            if not self._is_located_ball(parametric_coordinate, fixed_coordinate):
                 return parametric_coordinate - 1
 
             if parametric_coordinate == max_parametric_coordinate:
@@ -526,6 +1431,10 @@ class Compressor:
 
         return None
 
+    @abstractmethod
+    def _is_located_ball(self, parametric_coordinate, fixed_coordinate):
+        pass
+
     @abstractmethod
     def _get_max_parametric_coordinate(self):
         pass
@@ -543,11 +1452,13 @@ class Compressor:
         pass
 
     def _shift_ball(self, ball):
+        self._count_balls_shifted += 1
+
         self._board.remove_ball_on_board(ball)
 
-        self._shift_in_direction_ball(ball)
+        shifted_ball = self._shift_in_direction_ball(ball)
 
-        self._board.set_ball_on_board(ball, ball.get_point())
+        self._board.set_ball_on_board(shifted_ball, shifted_ball.get_point())
 
     @abstractmethod
     def _shift_in_direction_ball(self, ball):
@@ -560,10 +1471,12 @@ class VerticallyCompressor(Compressor):
         super().__init__(board, cluster)
 
     def _get_start_points_in_empty_ranges(self):
-        start_points = [self._cluster[0].get_point()]
+        balls = self._cluster.get_balls(self._board)
+
+        start_points = [balls[0].get_point()]
 
-        for index_ball in range(1, self._cluster.get_count_balls()):
-            point = self._cluster[index_ball].get_point()
+        for index_ball in range(1, len(balls)):
+            point = balls[index_ball].get_point()
 
             start_points.append(point)
 
@@ -591,9 +1504,7 @@ class VerticallyCompressor(Compressor):
         start_coordinate = shift_range.get_left_border()
 
         for offset_coordinate in range(start_coordinate, self._get_max_parametric_coordinate() + 1):
-            point = self._build_parametric_point(offset_coordinate, fixed_coordinate)
-
-            ball = self._board.get_ball_by_point(point)
+            ball = self._board.get_ball_by_coordinates(fixed_coordinate, offset_coordinate)
 
             if ball is None:
                 self._accumulative_offset += 1
@@ -602,6 +1513,9 @@ class VerticallyCompressor(Compressor):
 
             self._shift_ball(ball)
 
+    def _is_located_ball(self, parametric_coordinate, fixed_coordinate):
+        return self._board.get_ball_by_coordinates(fixed_coordinate, parametric_coordinate) is not None
+
     def _get_max_parametric_coordinate(self):
         return self._board.get_count_rows()
 
@@ -615,7 +1529,7 @@ class VerticallyCompressor(Compressor):
         return point.get_coordinate_x()
 
     def _shift_in_direction_ball(self, ball):
-        ball.shift_bottom_vertically(self._accumulative_offset)
+        return ball.shift_bottom_vertically(self._accumulative_offset)
 
 
 class HorizontallyCompressor(Compressor):
@@ -627,22 +1541,16 @@ class HorizontallyCompressor(Compressor):
         start_points = []
 
         min_coordinate_x = self._cluster.get_priority_ball().get_point().get_coordinate_x()
-        coordinate_y = 1
 
         if min_coordinate_x == 1:
-            point = Point(1, 1)
-
-            if not self._board.is_located_ball(point):
-                start_points.append(point)
+            if self._board.get_column_height(1) == 0:
+                start_points.append(Point(1, 1))
 
             min_coordinate_x = 2
 
         for coordinate_x in range(min_coordinate_x, self._board.get_count_columns()):
-            point = Point(coordinate_x, coordinate_y)
-            left_point = Point(coordinate_x - 1, coordinate_y)
-
-            if self._board.is_located_ball(left_point) and not self._board.is_located_ball(point):
-                start_points.append(point)
+            if self._board.get_column_height(coordinate_x - 1) > 0 and self._board.get_column_height(coordinate_x) == 0:
+                start_points.append(Point(coordinate_x, 1))
 
         return start_points
 
@@ -653,15 +1561,11 @@ class HorizontallyCompressor(Compressor):
         finish_coordinate = shift_range.get_right_border()
 
         for offset_coordinate in range(start_coordinate, finish_coordinate + 1):
-            for coordinate_y in range(1, self._board.get_count_rows() + 1):
-                point = self._build_parametric_point(offset_coordinate, coordinate_y)
+            for coordinate_y in range(1, self._board.get_column_height(offset_coordinate) + 1):
+                self._shift_ball(self._board.get_ball_by_coordinates(offset_coordinate, coordinate_y))
 
-                ball = self._board.get_ball_by_point(point)
-
-                if ball is None:
-                    break
-
-                self._shift_ball(ball)
+    def _is_located_ball(self, parametric_coordinate, fixed_coordinate):  # start points always lie at y = 1
+        return self._board.get_column_height(parametric_coordinate) >= fixed_coordinate
 
     def _get_max_parametric_coordinate(self):
         return self._board.get_count_columns()
@@ -676,11 +1580,138 @@ class HorizontallyCompressor(Compressor):
         return point.get_coordinate_y()
 
     def _shift_in_direction_ball(self, ball):
-        ball.shift_left_horizontally(self._accumulative_offset)
+        return ball.shift_left_horizontally(self._accumulative_offset)
+
+
+class VectorizedVerticallyCompressor:
+
+    def __init__(self, board, cluster):
+        self._board = board
+        self._cluster = cluster
+
+        self._count_balls_shifted = 0
+
+    def get_count_balls_shifted(self):
+        return self._count_balls_shifted
+
+    def run(self):
+        for coordinate_x, min_coordinate_y in self._get_min_coordinates_y_by_columns().items():
+            column = self._board.get_column(coordinate_x)
+
+            shifted_column = column[min_coordinate_y - 1:]
+
+            # the top row is never a left border, see Compressor._calc_left_border_shift_range
+            if all(ball is None for ball in shifted_column[:-1]):
+                continue
+
+            balls = [ball for ball in shifted_column if ball is not None]
+
+            for index_ball, ball in enumerate(balls):
+                offset = ball.get_point().get_coordinate_y() - (min_coordinate_y + index_ball)
+
+                if offset == 0:
+                    continue
+
+                balls[index_ball] = ball.shift_bottom_vertically(offset)
+
+                self._count_balls_shifted += 1
+
+            column[min_coordinate_y - 1:] = balls + [None] * (len(shifted_column) - len(balls))
+
+            self._board.set_column(coordinate_x, column)
+
+    def _get_min_coordinates_y_by_columns(self):
+        min_coordinates_y_by_columns = {}
+
+        for ball in self._cluster.get_balls(self._board):
+            point = ball.get_point()
+
+            coordinate_x = point.get_coordinate_x()
+            coordinate_y = point.get_coordinate_y()
+
+            min_coordinate_y = min_coordinates_y_by_columns.get(coordinate_x, coordinate_y)
+
+            min_coordinates_y_by_columns[coordinate_x] = min(min_coordinate_y, coordinate_y)
+
+        return min_coordinates_y_by_columns
+
+
+class VectorizedHorizontallyCompressor:
+
+    def __init__(self, board, cluster):
+        self._board = board
+        self._cluster = cluster
+
+        self._count_balls_shifted = 0
+
+    def get_count_balls_shifted(self):
+        return self._count_balls_shifted
+
+    def run(self):
+        count_columns = self._board.get_count_columns()
+
+        bottom_occupied = [self._board.get_column_height(x) > 0 for x in range(1, count_columns + 1)]
+
+        first_start_column = self._find_first_start_column(bottom_occupied)
+
+        if first_start_column is None:
+            return
+
+        sources = [x for x in range(first_start_column + 1, count_columns + 1) if bottom_occupied[x - 1]]
+
+        # the last column is never a left border, see Compressor._calc_left_border_shift_range
+        if count_columns > 1 and not bottom_occupied[count_columns - 2] and count_columns in sources:
+            sources.pop()
+
+        segments = [self._pop_segment(source) for source in sources]
+
+        for target, segment in enumerate(segments, first_start_column):
+            self._put_segment(target, segment)
+
+    def _find_first_start_column(self, bottom_occupied):
+        min_coordinate_x = self._cluster.get_priority_ball().get_point().get_coordinate_x()
+
+        if min_coordinate_x == 1:
+            if not bottom_occupied[0]:
+                return 1
+
+            min_coordinate_x = 2
+
+        for coordinate_x in range(min_coordinate_x, self._board.get_count_columns()):
+            if bottom_occupied[coordinate_x - 2] and not bottom_occupied[coordinate_x - 1]:
+                return coordinate_x
+
+        return None
+
+    def _pop_segment(self, coordinate_x):
+        column = self._board.get_column(coordinate_x)
+
+        height = self._board.get_column_height(coordinate_x)
+
+        segment = column[:height]
+
+        column[:height] = [None] * height
+
+        self._board.set_column(coordinate_x, column)
+
+        return segment
+
+    def _put_segment(self, coordinate_x, segment):
+        column = self._board.get_column(coordinate_x)
+
+        segment = [ball.shift_left_horizontally(ball.get_point().get_coordinate_x() - coordinate_x) for ball in segment]
+
+        column[:len(segment)] = segment
+
+        self._board.set_column(coordinate_x, column)
+
+        self._count_balls_shifted += len(segment)
 
 
 class ShiftRange:
 
+    __slots__ = ('_left_border', '_right_border', '_offset')
+
     def __init__(self, left_border, right_border, offset):
         self._left_border = left_border
         self._right_border = right_border
@@ -707,6 +1738,15 @@ class Strategy:
     def get_best_cluster(self):
         pass
 
+    def _find_cluster_by_priority_coordinates(self, priority_coordinates):
+        for cluster in self._board.get_clusters():
+            point = cluster.get_priority_ball().get_point()
+
+            if (point.get_coordinate_x(), point.get_coordinate_y()) == priority_coordinates:
+                return cluster
+
+        return None
+
 
 class SimpleStrategy(Strategy):
 
@@ -714,31 +1754,18 @@ class SimpleStrategy(Strategy):
         super().__init__(board)
 
     def get_best_cluster(self):
-        best_cluster = None
-
-        for cluster in self._board.get_clusters():
-            if best_cluster is None:
-                best_cluster = cluster
-
-                continue
-
-            if cluster.get_count_balls() == best_cluster.get_count_balls():
-                best_cluster_priority_ball = best_cluster.get_priority_ball()
-                cluster_priority_ball = cluster.get_priority_ball()
-
-                if cluster_priority_ball.is_priority(best_cluster_priority_ball):
-                    best_cluster = cluster
-            elif cluster.get_count_balls() > best_cluster.get_count_balls():
-                best_cluster = cluster
-
-        return best_cluster
+        return self._board.get_best_cluster()
 
 
 class Move:
 
-    def __init__(self, number, ball, count_balls_removed, score):
+    __slots__ = ('_number', '_row', '_column', '_color', '_count_balls_removed', '_score')
+
+    def __init__(self, number, row, column, color, count_balls_removed, score):
         self._number = number
-        self._ball = ball
+        self._row = row
+        self._column = column
+        self._color = color
         self._count_balls_removed = count_balls_removed
         self._score = score
 
@@ -746,13 +1773,13 @@ class Move:
         return self._number
 
     def get_row(self):
-        return self._ball.get_point().get_coordinate_y()
+        return self._row
 
     def get_column(self):
-        return self._ball.get_point().get_coordinate_x()
+        return self._column
 
     def get_color(self):
-        return self._ball.get_color().value
+        return self._color
 
     def get_count_balls_removed(self):
         return self._count_balls_removed
@@ -44,9 +44,90 @@ class InvalidCountBoardColumnsException(CustomException):
         super().__init__(message)
 
 
+class UnexpectedEndOfInputException(CustomException):
+
+    def __init__(self):
+        message = 'Unexpected end of input'
+
+        super().__init__(message)
+
+
+class InvalidMemoryMappedInputException(CustomException):
+
+    def __init__(self, reason):
+        message = 'Input can not be memory-mapped: {}'.format(reason)
+
+        super().__init__(message)
+
+
 class InvalidCountBoardRowsException(CustomException):
 
     def __init__(self, count, necessary_count):
         message = 'Invalid count of the board rows = {}. Necessary: {}'.format(count, necessary_count)
 
         super().__init__(message)
+
+
+class InvalidGameException(CustomException):
+
+    def __init__(self, number_game, message):
+        message = 'Game {}: {}'.format(number_game, message)
+
+        super().__init__(message)
+
+
+class InvalidBoardSizeException(CustomException):
+
+    def __init__(self, count_rows, count_columns):
+        message = 'Invalid board size = {}x{}. Necessary: positive counts of rows and columns'.format(count_rows,
+                                                                                                   count_columns)
+
+        super().__init__(message)
+
+
+class InvalidCacheFileException(CustomException):
+
+    def __init__(self, path):
+        message = 'Invalid cache file = {}'.format(path)
+
+        super().__init__(message)
+
+
+class InvalidMoveNumberException(CustomException):
+
+    def __init__(self, number_move, count_moves):
+        message = 'Invalid number of the move = {}. Necessary: from 0 to {}'.format(number_move, count_moves)
+
+        super().__init__(message)
+
+
+class GameHistoryNotRecordedException(CustomException):
+
+    def __init__(self):
+        message = 'History of the game is not recorded'
+
+        super().__init__(message)
+
+
+class InvalidRequestFrameException(CustomException):
+
+    def __init__(self, header):
+        message = 'Invalid request frame = {}. Necessary: <request id> <payload length>'.format(header)
+
+        super().__init__(message)
+
+
+class RequestTimeoutException(CustomException):
+
+    def __init__(self, timeout):
+        message = 'Request timed out after {} seconds'.format(timeout)
+
+        super().__init__(message)
+
+
+class InvalidEngineStrategyException(CustomException):
+
+    def __init__(self, engine, strategy):
+        message = 'Invalid strategy = {} for the engine = {}. Necessary: simple'.format(strategy, engine)
+
+        super().__init__(message)
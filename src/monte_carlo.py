@@ -0,0 +1,131 @@
+import concurrent.futures
+import functools
+import multiprocessing
+import random
+import statistics
+import time
+
+from src.entities import Strategy, SimpleStrategy
+from src.bit_board import BitBoard, build_bit_board_by_board
+
+
+AGGREGATES = {'mean': statistics.fmean, 'max': max}
+
+COUNT_PLAYOUTS_PER_ROUND = 8
+
+
+class MonteCarloStrategy(Strategy):
+
+    def __init__(self, board, count_playouts=32, time_budget=None, beam_width=8, epsilon=0.25, aggregate='mean',
+                 count_workers=1, seed=0):
+        super().__init__(board)
+
+        self._count_playouts = count_playouts
+        self._time_budget = time_budget
+        self._beam_width = beam_width
+        self._epsilon = epsilon
+        self._aggregate = AGGREGATES[aggregate]
+        self._count_workers = count_workers
+        self._seed = seed
+
+        self._number_move = 0
+
+    def get_best_cluster(self):
+        self._number_move += 1
+
+        deadline = time.perf_counter() + self._time_budget if self._time_budget is not None else None
+
+        bit_board = build_bit_board_by_board(self._board)
+
+        candidates = self._get_candidates(bit_board)
+
+        if len(candidates) < 2:
+            return SimpleStrategy(self._board).get_best_cluster()
+
+        children = [self._build_child(bit_board, candidate) for candidate in candidates]
+
+        values = [[] for _ in candidates]
+
+        for first_playout in range(0, self._count_playouts, COUNT_PLAYOUTS_PER_ROUND):
+            tasks = [self._build_task(child, index_candidate, first_playout)
+                     for index_candidate, child in enumerate(children)]
+
+            for index_candidate, playout_values in enumerate(self._map(play_rollouts, tasks)):
+                values[index_candidate].extend(playout_values)
+
+            # the round in progress is finished, so every candidate is played; the moves depend on the machine speed
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        best_index = max(range(0, len(candidates)), key=lambda index: (
+            self._calc_score_per_move(candidates[index].get_count_balls()) + self._aggregate(values[index])))
+
+        return self._find_cluster_by_priority_coordinates(candidates[best_index].get_priority_coordinates())
+
+    def _get_candidates(self, bit_board):
+        clusters = [cluster for cluster in bit_board.get_clusters() if cluster.get_count_balls() >= 2]
+
+        clusters.sort(key=lambda cluster: (-cluster.get_count_balls(), cluster.get_priority_index()))
+
+        return clusters[:self._beam_width]
+
+    def _build_child(self, bit_board, cluster):
+        child_board = bit_board.fork()
+
+        child_board.remove_cluster(cluster)
+
+        return child_board
+
+    def _build_task(self, child_board, index_candidate, first_playout):
+        last_playout = min(first_playout + COUNT_PLAYOUTS_PER_ROUND, self._count_playouts)
+
+        seeds = ['{}-{}-{}-{}'.format(self._seed, self._number_move, index_candidate, index_playout)
+                 for index_playout in range(first_playout, last_playout)]
+
+        return (child_board.get_masks(), child_board.get_count_rows(), child_board.get_count_columns(), seeds,
+                self._epsilon)
+
+    def _map(self, function, tasks):
+        if self._count_workers == 1:
+            return map(function, tasks)
+
+        return get_rollouts_executor(self._count_workers).map(function, tasks)
+
+    def _calc_score_per_move(self, count_balls_removed):
+        return pow(count_balls_removed - 2, 2)
+
+
+@functools.lru_cache(maxsize=None)
+def get_rollouts_executor(count_workers):
+    return concurrent.futures.ProcessPoolExecutor(count_workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+def play_rollouts(task):
+    masks, count_rows, count_columns, seeds, epsilon = task
+
+    return [play_rollout(BitBoard(list(masks), count_rows, count_columns), random.Random(seed), epsilon)
+            for seed in seeds]
+
+
+def play_rollout(bit_board, generator, epsilon):  # a random move with probability epsilon, the greedy one otherwise
+    value = 0
+
+    while True:
+        if generator.random() < epsilon:
+            clusters = [cluster for cluster in bit_board.get_clusters() if cluster.get_count_balls() >= 2]
+
+            cluster = generator.choice(clusters) if len(clusters) > 0 else None
+        else:
+            cluster = bit_board.get_best_cluster()
+
+        if cluster is None or cluster.get_count_balls() < 2:
+            break
+
+        bit_board.remove_cluster(cluster)
+
+        value += pow(cluster.get_count_balls() - 2, 2)
+
+    if bit_board.get_balls_remaining() == 0:
+        value += 1000
+
+    return value
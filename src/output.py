@@ -0,0 +1,127 @@
+import struct
+from abc import ABCMeta, abstractmethod
+
+
+DEFAULT_FLUSH_THRESHOLD = 1 << 16
+
+
+class MovesWriter:
+
+    __metaclass__ = ABCMeta
+
+    def __init__(self, stream, flush_threshold=DEFAULT_FLUSH_THRESHOLD):
+        self._stream = stream
+        self._flush_threshold = flush_threshold
+
+        self._buffer = bytearray()
+
+        self._count_games = 0
+
+    def write_games(self, games):
+        for game in games:
+            self.write_game(game)
+
+    def write_game(self, game):
+        self._count_games += 1
+
+        self._write_game_header(game)
+
+        for move in game.get_moves():
+            self._write_move(move)
+
+            if len(self._buffer) >= self._flush_threshold:
+                self.flush()
+
+        self._write_game_footer(game)
+
+        if len(self._buffer) >= self._flush_threshold:
+            self.flush()
+
+    def flush(self):
+        self._stream.write(self._buffer)
+        self._stream.flush()
+
+        self._buffer.clear()
+
+    def close(self):
+        self.flush()
+
+    @abstractmethod
+    def _write_game_header(self, game):
+        pass
+
+    @abstractmethod
+    def _write_move(self, move):
+        pass
+
+    @abstractmethod
+    def _write_game_footer(self, game):
+        pass
+
+
+class TextMovesWriter(MovesWriter):
+
+    def __init__(self, stream, flush_threshold=DEFAULT_FLUSH_THRESHOLD):
+        super().__init__(stream, flush_threshold)
+
+    def _write_game_header(self, game):
+        if self._count_games != 1:
+            self._buffer += b'\n'
+
+        self._buffer += b'Game %d:\n' % self._count_games
+
+    def _write_move(self, move):
+        self._buffer += b'Move %d at (%d,%d): removed %d balls of color %s, got %d points.\n' % (
+            move.get_number(), move.get_row(), move.get_column(), move.get_count_balls_removed(),
+            move.get_color().encode(), move.get_score())
+
+    def _write_game_footer(self, game):
+        self._buffer += b'Final score: %d, with %d balls remaining.\n' % (
+            game.get_player_score(), game.get_balls_remaining())
+
+
+class CsvMovesWriter(MovesWriter):
+
+    def __init__(self, stream, flush_threshold=DEFAULT_FLUSH_THRESHOLD):
+        super().__init__(stream, flush_threshold)
+
+        self._buffer += b'record,game,move,row,column,color,balls,score\n'
+
+    def _write_game_header(self, game):
+        pass
+
+    def _write_move(self, move):
+        self._buffer += b'move,%d,%d,%d,%d,%s,%d,%d\n' % (
+            self._count_games, move.get_number(), move.get_row(), move.get_column(), move.get_color().encode(),
+            move.get_count_balls_removed(), move.get_score())
+
+    def _write_game_footer(self, game):
+        self._buffer += b'final,%d,%d,,,,%d,%d\n' % (
+            self._count_games, len(game.get_moves()), game.get_balls_remaining(), game.get_player_score())
+
+
+class BinaryMovesWriter(MovesWriter):
+
+    GAME_HEADER = struct.Struct('<IIQI')  # game, count moves, final score, balls remaining
+    MOVE = struct.Struct('<IHHcIQ')  # move, row, column, color, balls removed, score
+
+    def __init__(self, stream, flush_threshold=DEFAULT_FLUSH_THRESHOLD):
+        super().__init__(stream, flush_threshold)
+
+    def _write_game_header(self, game):
+        self._buffer += self.GAME_HEADER.pack(self._count_games, len(game.get_moves()), game.get_player_score(),
+                                              game.get_balls_remaining())
+
+    def _write_move(self, move):
+        self._buffer += self.MOVE.pack(move.get_number(), move.get_row(), move.get_column(),
+                                       move.get_color().encode(), move.get_count_balls_removed(), move.get_score())
+
+    def _write_game_footer(self, game):
+        pass
+
+
+MOVES_WRITERS = {
+    'text': TextMovesWriter,
+    'csv': CsvMovesWriter,
+    'binary': BinaryMovesWriter,
+}
@@ -0,0 +1,162 @@
+import mmap
+
+from src.exceptions import InvalidCountGamesException, InvalidSeparatorGamesException, InvalidColorException, \
+    InvalidCountBoardColumnsException, InvalidBoardSizeException, UnexpectedEndOfInputException, \
+    InvalidMemoryMappedInputException
+from src.entities import Color, Board, Ball, Point
+
+
+COLORS_BY_BYTES = [None] * 256
+
+for color in Color:
+    COLORS_BY_BYTES[ord(color.value)] = color
+
+COLOR_BYTES = bytes(ord(color.value) for color in Color)
+
+
+class BoardsParser:
+
+    def __init__(self, source, count_rows, count_columns, is_memory_mapped=False, chunk_size=1 << 20):
+        if count_rows < 1 or count_columns < 1:  # the default size of games without a header
+            raise InvalidBoardSizeException(count_rows, count_columns)
+
+        self._source = source
+        self._count_rows = count_rows
+        self._count_columns = count_columns
+        self._chunk_size = chunk_size
+
+        self._buffer = b''
+        self._position = 0
+
+        if is_memory_mapped:
+            self._buffer = self._map_source(source)
+            self._source = None
+
+    def _map_source(self, source):
+        try:
+            return mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:  # pipes and empty files can not be mapped
+            raise InvalidMemoryMappedInputException(e)
+
+    def iterate_boards_rows(self):
+        count_boards = int(self._read_line())
+
+        if count_boards < 1:
+            raise InvalidCountGamesException()
+
+        for number_boards in range(0, count_boards):
+            if self._read_line() != b'':
+                raise InvalidSeparatorGamesException()
+
+            yield self._read_board_rows()
+
+    def _read_board_rows(self):  # rows are checked as they are read, so errors come in the order of the input
+        line = self._read_line()
+
+        size = parse_board_size(line)
+
+        if size is None:
+            check_row(line, self._count_columns)
+
+            rows = [line] + [self._read_board_row(self._count_columns) for _ in range(1, self._count_rows)]
+
+            return rows, self._count_rows, self._count_columns
+
+        count_rows, count_columns = size
+
+        return [self._read_board_row(count_columns) for _ in range(0, count_rows)], count_rows, count_columns
+
+    def _read_board_row(self, count_columns):
+        row = self._read_line()
+
+        check_row(row, count_columns)
+
+        return row
+
+    def _read_line(self):
+        end = self._buffer.find(b'\n', self._position)
+
+        while end == -1 and self._read_chunk():
+            end = self._buffer.find(b'\n', self._position)
+
+        if end == -1:
+            if self._position >= len(self._buffer):
+                raise UnexpectedEndOfInputException()
+
+            end = len(self._buffer)
+
+        line = self._buffer[self._position:end]
+
+        self._position = end + 1
+
+        return line
+
+    def _read_chunk(self):
+        if self._source is None:
+            return False
+
+        chunk = self._source.read(self._chunk_size)
+
+        if not chunk:
+            return False
+
+        self._buffer = self._buffer[self._position:] + chunk
+        self._position = 0
+
+        return True
+
+
+def parse_board_size(line):
+    counts = line.split(b' ')
+
+    if len(counts) != 2 or not all(count.isdigit() for count in counts):
+        return None
+
+    count_rows, count_columns = int(counts[0]), int(counts[1])
+
+    if count_rows < 1 or count_columns < 1:
+        raise InvalidBoardSizeException(count_rows, count_columns)
+
+    return count_rows, count_columns
+
+
+def check_rows(rows, count_columns):
+    for row in rows:
+        check_row(row, count_columns)
+
+
+def check_row(row, count_columns):
+    text = None
+
+    if row.isascii():
+        count_row_columns = len(row)
+    else:
+        text = row.decode(errors='replace')
+
+        count_row_columns = len(text)
+
+    if count_row_columns != count_columns:
+        raise InvalidCountBoardColumnsException(count_row_columns, count_columns)
+
+    if len(row.translate(None, COLOR_BYTES)) == 0:
+        return
+
+    if text is None:
+        text = row.decode(errors='replace')
+
+    for color in text:
+        if color not in Color.__members__:
+            raise InvalidColorException(color)
+
+
+def build_board_by_rows(rows, count_rows, count_columns, profiler=None):
+    check_rows(rows, count_columns)
+
+    balls = []
+
+    for y, row in zip(range(count_rows, 0, -1), rows):
+        balls.append([Ball(Point(x, y), COLORS_BY_BYTES[code]) for x, code in enumerate(row, 1)])
+
+    balls.reverse()
+
+    return Board(balls, count_rows, count_columns, profiler=profiler)
@@ -0,0 +1,110 @@
+import time
+
+
+TIMERS = ('strategy', 'remove_cluster', 'compression', 'init_clusters', 'update_clusters')
+
+COUNTERS = ('clusters_built', 'merges_attempted', 'balls_shifted')
+
+
+class Profiler:
+
+    def __init__(self):
+        self._seconds = dict.fromkeys(TIMERS, 0.0)
+        self._calls = dict.fromkeys(TIMERS, 0)
+        self._counters = dict.fromkeys(COUNTERS, 0)
+
+    def is_enabled(self):
+        return True
+
+    def start(self):
+        return time.perf_counter()
+
+    def stop(self, timer, start):
+        self._seconds[timer] += time.perf_counter() - start
+        self._calls[timer] += 1
+
+    def add_count(self, counter, count):
+        self._counters[counter] += count
+
+    def get_seconds(self, timer):
+        return self._seconds[timer]
+
+    def get_calls(self, timer):
+        return self._calls[timer]
+
+    def get_count(self, counter):
+        return self._counters[counter]
+
+    def merge(self, other_profiler):
+        for timer in TIMERS:
+            self._seconds[timer] += other_profiler.get_seconds(timer)
+            self._calls[timer] += other_profiler.get_calls(timer)
+
+        for counter in COUNTERS:
+            self._counters[counter] += other_profiler.get_count(counter)
+
+    def format(self):
+        timers = ', '.join('{} {:.6f}s/{}'.format(timer, self._seconds[timer], self._calls[timer]) for timer in TIMERS)
+        counters = ', '.join('{} {}'.format(counter, self._counters[counter]) for counter in COUNTERS)
+
+        return '{}; {}'.format(timers, counters)
+
+
+class NullProfiler(Profiler):
+
+    def __init__(self):
+        super().__init__()
+
+    def is_enabled(self):
+        return False
+
+    def start(self):
+        return 0
+
+    def stop(self, timer, start):
+        pass
+
+    def add_count(self, counter, count):
+        pass
+
+
+class ProfilesReport:
+
+    def __init__(self, stream):
+        self._stream = stream
+
+        self._total_profiler = Profiler()
+
+        self._count_games = 0
+        self._count_profiled_games = 0
+
+    def report_games(self, games):
+        for game in games:
+            self.report_game(game)
+
+            yield game
+
+        self.report_total()
+
+    def report_game(self, game):
+        self._count_games += 1
+
+        profiler = game.get_profiler()
+
+        if profiler is None or not profiler.is_enabled():
+            self._stream.write('Game {}: not profiled, result is taken from the cache or played in a batch\n'.format(
+                self._count_games))
+
+            return
+
+        self._count_profiled_games += 1
+
+        self._total_profiler.merge(profiler)
+
+        self._stream.write('Game {}: {}\n'.format(self._count_games, profiler.format()))
+
+    def report_total(self):
+        self._stream.write('Total ({} of {} games played): {}\n'.format(
+            self._count_profiled_games, self._count_games, self._total_profiler.format()))
+
+        self._stream.flush()
@@ -0,0 +1,241 @@
+import asyncio
+import multiprocessing
+import signal
+import sys
+
+from src.exceptions import CustomException, InvalidRequestFrameException, RequestTimeoutException
+
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_TIMEOUT = 30.0
+
+
+class GameService:
+
+    def __init__(self, play_request, task_arguments, count_workers=1, queue_size=DEFAULT_QUEUE_SIZE,
+                 timeout=DEFAULT_TIMEOUT):
+        self._play_request = play_request
+        self._task_arguments = task_arguments
+        self._count_workers = count_workers
+        self._queue_size = queue_size
+        self._timeout = timeout
+
+        self._queue = None
+        self._game_workers = None
+
+    async def serve_unix_socket(self, path):
+        workers = self._start()
+
+        try:
+            server = await asyncio.start_unix_server(self.handle_connection, path)
+
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+
+            async with server:
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._stop(workers)
+
+    async def serve_stdio(self):
+        workers = self._start()
+
+        try:
+            reader, writer = await open_stdio_streams()
+
+            await self.handle_connection(reader, writer)
+        finally:
+            self._stop(workers)
+
+    def _start(self):
+        self._queue = asyncio.Queue(self._queue_size)
+
+        self._game_workers = [GameWorker() for _ in range(0, self._count_workers)]
+
+        for game_worker in self._game_workers:
+            game_worker.start()
+
+        return [asyncio.create_task(self._work(game_worker)) for game_worker in self._game_workers]
+
+    def _stop(self, workers):
+        for worker in workers:
+            worker.cancel()
+
+        for game_worker in self._game_workers:
+            game_worker.stop()
+
+    async def handle_connection(self, reader, writer):
+        pending_requests = []
+
+        try:
+            while True:
+                request = await self._read_request(reader, writer)
+
+                if request is None:
+                    break
+
+                pending_requests = [pending for pending in pending_requests if not pending.is_answered()]
+                pending_requests.append(request)
+
+                await self._queue.put(request)  # backpressure: the connection is not read while the queue is full
+        except CustomException as e:
+            await ServiceRequest(b'-', b'', writer).respond_error(e.message)
+
+        await asyncio.gather(*(request.wait_answered() for request in pending_requests))
+
+        writer.close()
+
+    async def _read_request(self, reader, writer):
+        header = await reader.readline()
+
+        if header == b'':
+            return None
+
+        fields = header.split()
+
+        if len(fields) != 2 or not fields[1].isdigit():
+            raise InvalidRequestFrameException(header.rstrip(b'\n').decode(errors='replace'))
+
+        try:
+            payload = await reader.readexactly(int(fields[1]))
+        except asyncio.IncompleteReadError:
+            raise InvalidRequestFrameException(header.rstrip(b'\n').decode(errors='replace'))
+
+        return ServiceRequest(fields[0], payload, writer)
+
+    async def _work(self, game_worker):
+        while True:
+            request = await self._queue.get()
+
+            try:
+                await self._play(request, game_worker)
+            finally:
+                self._queue.task_done()
+
+    async def _play(self, request, game_worker):
+        timeout = self._timeout - request.get_waiting_time()  # the time in the queue is a part of the timeout
+
+        if timeout <= 0:
+            await request.respond_error(RequestTimeoutException(self._timeout).message)
+
+            return
+
+        task = (request.get_payload(),) + self._task_arguments
+
+        try:
+            body, error_message = await game_worker.play(self._play_request, task, timeout)
+        except asyncio.TimeoutError:
+            await request.respond_error(RequestTimeoutException(self._timeout).message)
+
+            return
+        except Exception as e:
+            await request.respond_error('Internal error: {}: {}'.format(type(e).__name__, e))
+
+            return
+
+        if error_message is not None:
+            await request.respond_error(error_message)
+
+            return
+
+        await request.respond(body)
+
+
+class GameWorker:  # plays one game at a time in its own process, which is replaced when a game runs out of time
+
+    def __init__(self):
+        self._pool = None
+
+    def start(self):
+        # forked workers would inherit the sockets of open connections and keep them from closing
+        self._pool = multiprocessing.get_context('spawn').Pool(1)
+
+    def stop(self):
+        self._pool.terminate()
+
+    async def play(self, play_request, task, timeout):
+        loop = asyncio.get_running_loop()
+
+        future = loop.create_future()
+
+        self._pool.apply_async(play_request, (task,),
+                               callback=lambda result: loop.call_soon_threadsafe(set_future_result, future, result),
+                               error_callback=lambda e: loop.call_soon_threadsafe(set_future_exception, future, e))
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            # a game cannot be stopped inside the process, so the process is killed and the next game gets a new one
+            await loop.run_in_executor(None, self._pool.terminate)
+
+            self.start()
+
+            raise
+
+
+def set_future_result(future, result):
+    if not future.done():  # the future is cancelled when the game runs out of time
+        future.set_result(result)
+
+
+def set_future_exception(future, exception):
+    if not future.done():
+        future.set_exception(exception)
+
+
+class ServiceRequest:
+
+    def __init__(self, request_id, payload, writer):
+        self._request_id = request_id
+        self._payload = payload
+        self._writer = writer
+
+        self._received_time = asyncio.get_running_loop().time()
+
+        self._answered = asyncio.Event()
+
+    def get_request_id(self):
+        return self._request_id
+
+    def get_payload(self):
+        return self._payload
+
+    def get_waiting_time(self):
+        return asyncio.get_running_loop().time() - self._received_time
+
+    def is_answered(self):
+        return self._answered.is_set()
+
+    async def wait_answered(self):
+        await self._answered.wait()
+
+    async def respond(self, body):
+        await self._write_frame(b'ok', body)
+
+    async def respond_error(self, message):
+        await self._write_frame(b'error', message.encode())
+
+    async def _write_frame(self, status, body):
+        self._writer.write(b'%s %s %d\n%s' % (self._request_id, status, len(body), body))
+
+        try:
+            await self._writer.drain()
+        except ConnectionError:
+            pass
+
+        self._answered.set()
+
+
+async def open_stdio_streams():
+    loop = asyncio.get_running_loop()
+
+    reader = asyncio.StreamReader()
+
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+
+    return reader, writer
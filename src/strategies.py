@@ -0,0 +1,152 @@
+import collections
+import time
+
+import numpy as np
+
+from src.entities import EMPTY_CODE, COLOR_CODES, Strategy, SimpleStrategy
+from src.array_board import ArrayBoard, build_cells_by_board
+
+
+DEFAULT_TRANSPOSITION_TABLE_SIZE = 1 << 16
+
+
+class LookaheadStrategy(Strategy):
+
+    def __init__(self, board, depth=3, beam_width=6, time_budget=0.2, node_budget=20000, seed=0,
+                 transposition_table_size=DEFAULT_TRANSPOSITION_TABLE_SIZE):
+        super().__init__(board)
+
+        self._depth = depth
+        self._beam_width = beam_width
+        self._time_budget = time_budget
+        self._node_budget = node_budget
+        self._transposition_table_size = transposition_table_size
+
+        self._zobrist_hasher = ZobristHasher(board.get_count_rows() * board.get_count_columns(), seed)
+
+        self._transposition_table = collections.OrderedDict()  # kept between moves, least recently used go first
+
+        self._deadline = 0
+        self._count_nodes = 0
+
+    def get_best_cluster(self):
+        array_board = ArrayBoard(build_cells_by_board(self._board))
+
+        candidates = self._get_candidates(array_board)
+
+        if len(candidates) == 0:
+            return SimpleStrategy(self._board).get_best_cluster()
+
+        best_candidate = self._search(array_board, candidates)
+
+        return self._find_cluster_by_priority_coordinates(best_candidate.get_priority_coordinates())
+
+    def _search(self, array_board, candidates):
+        self._deadline = time.perf_counter() + self._time_budget
+        self._count_nodes = 0
+
+        best_candidate = candidates[0]
+
+        for depth in range(1, self._depth + 1):  # iterative deepening keeps the last fully searched depth
+            best_value = -1
+            best_depth_candidate = None
+
+            for candidate in candidates:
+                value = self._evaluate_move(array_board, candidate, depth)
+
+                if value is None:
+                    return best_candidate
+
+                if value > best_value:
+                    best_value = value
+                    best_depth_candidate = candidate
+
+            best_candidate = best_depth_candidate
+
+        return best_candidate
+
+    def _evaluate_move(self, array_board, cluster, depth):
+        if self._is_budget_exhausted():
+            return None
+
+        self._count_nodes += 1
+
+        child_board = array_board.fork()
+
+        child_board.remove_cluster(cluster)
+
+        value = self._calc_score_per_move(cluster.get_count_balls())
+
+        child_value = self._evaluate_board(child_board, depth - 1)
+
+        if child_value is None:
+            return None
+
+        return value + child_value
+
+    def _evaluate_board(self, array_board, depth):
+        if array_board.get_balls_remaining() == 0:
+            return 1000
+
+        if depth == 0:
+            return 0
+
+        board_hash = self._zobrist_hasher.calc_hash(array_board.get_cells())
+
+        stored = self._transposition_table.get(board_hash)
+
+        if stored is not None:
+            self._transposition_table.move_to_end(board_hash)
+
+            if stored[0] >= depth:
+                return stored[1]
+
+        best_value = 0
+
+        for candidate in self._get_candidates(array_board):
+            value = self._evaluate_move(array_board, candidate, depth)
+
+            if value is None:
+                return None
+
+            best_value = max(best_value, value)
+
+        self._store_position(board_hash, depth, best_value)
+
+        return best_value
+
+    def _store_position(self, board_hash, depth, value):
+        self._transposition_table[board_hash] = (depth, value)
+
+        self._transposition_table.move_to_end(board_hash)
+
+        if len(self._transposition_table) > self._transposition_table_size:
+            self._transposition_table.popitem(last=False)
+
+    def _get_candidates(self, array_board):
+        cluster_sizes = array_board.get_cluster_sizes()
+
+        order = np.argsort(-cluster_sizes, kind='stable')[:self._beam_width]
+
+        return [array_board.build_cluster(int(index)) for index in order if cluster_sizes[index] >= 2]
+
+    def _is_budget_exhausted(self):
+        return self._count_nodes >= self._node_budget or time.perf_counter() >= self._deadline
+
+    def _calc_score_per_move(self, count_balls_removed):
+        return pow(count_balls_removed - 2, 2)
+
+
+class ZobristHasher:
+
+    def __init__(self, count_cells, seed=0):
+        generator = np.random.default_rng(seed)
+
+        self._table = generator.integers(0, np.iinfo(np.uint64).max, size=(count_cells, len(COLOR_CODES) + 1),
+                                         dtype=np.uint64, endpoint=True)
+        self._table[:, EMPTY_CODE] = 0
+
+        self._cell_indexes = np.arange(0, count_cells)
+
+    def calc_hash(self, cells):
+        return int(np.bitwise_xor.reduce(self._table[self._cell_indexes, cells.reshape(-1)]))
@@ -0,0 +1,102 @@
+import random
+import unittest
+
+from src.entities import Board, Ball, Point, RGBGame, Player, SimpleStrategy
+from src.parser import COLORS_BY_BYTES
+
+
+MODES = ((True, True), (True, False), (False, True), (False, False))
+
+
+def build_board(rows, is_incremental_clusterization, is_vectorized_compression):
+    count_rows = len(rows)
+    count_columns = len(rows[0])
+
+    balls = [[Ball(Point(x, y), COLORS_BY_BYTES[code]) for x, code in enumerate(row, 1)]
+             for y, row in zip(range(1, count_rows + 1), reversed(rows))]
+
+    return Board(balls, count_rows, count_columns, is_incremental_clusterization, is_vectorized_compression)
+
+
+def generate_rows(generator, count_rows, count_columns):
+    return [bytes(generator.choice(b'RGB') for _ in range(0, count_columns)) for _ in range(0, count_rows)]
+
+
+def take_snapshot(board):
+    cells = []
+
+    for y in range(1, board.get_count_rows() + 1):
+        for x in range(1, board.get_count_columns() + 1):
+            ball = board.get_ball_by_coordinates(x, y)
+
+            cells.append(None if ball is None else ball.get_color())
+
+    clusters = sorted(sorted((ball.get_point().get_coordinate_x(), ball.get_point().get_coordinate_y())
+                             for ball in cluster.get_balls(board)) for cluster in board.get_clusters())
+
+    best_cluster = board.get_best_cluster()
+
+    best_point = None if best_cluster is None else best_cluster.get_priority_ball().get_point()
+
+    return cells, clusters, board.get_balls_remaining(), best_point
+
+
+def play(board):
+    game = RGBGame(Player(), board, SimpleStrategy(board))
+
+    game.run()
+
+    result = game.get_result()
+
+    return result.get_player_score(), result.get_balls_remaining(), len(result.get_moves())
+
+
+class BoardForkTest(unittest.TestCase):
+
+    def setUp(self):
+        generator = random.Random(7)
+
+        self.boards_rows = [generate_rows(generator, *size) for size in ((10, 15), (7, 9), (3, 4), (1, 6))]
+
+    def test_fork_does_not_change_board(self):
+        for modes in MODES:
+            for rows in self.boards_rows:
+                board = build_board(rows, *modes)
+
+                snapshot = take_snapshot(board)
+
+                play(board.fork())
+
+                self.assertEqual(take_snapshot(board), snapshot)
+
+    def test_board_does_not_change_fork(self):
+        for modes in MODES:
+            for rows in self.boards_rows:
+                board = build_board(rows, *modes)
+
+                board.remove_cluster(board.get_best_cluster())
+
+                child_board = board.fork()
+
+                snapshot = take_snapshot(child_board)
+
+                play(board)
+
+                self.assertEqual(take_snapshot(child_board), snapshot)
+
+    def test_fork_plays_as_board(self):
+        for modes in MODES:
+            for rows in self.boards_rows:
+                board = build_board(rows, *modes)
+
+                child_board = board.fork()
+
+                self.assertEqual(play(child_board), play(build_board(rows, *modes)))
+
+                grandchild_board = board.fork().fork()
+
+                self.assertEqual(play(grandchild_board), play(board))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+
+from src.entities import Cluster, Ball, Point, Color
+from src.exceptions import InvalidBallColorClusterException
+from src.parser import build_board_by_rows
+
+
+def build_cluster(coordinates, color=Color.R):
+    cluster = Cluster(color)
+
+    for coordinate_x, coordinate_y in coordinates:
+        cluster.add_ball(Ball(Point(coordinate_x, coordinate_y), color))
+
+    return cluster
+
+
+def get_coordinates(cluster):
+    return [(ball.get_point().get_coordinate_x(), ball.get_point().get_coordinate_y())
+            for ball in cluster.get_balls()]
+
+
+class ClusterTest(unittest.TestCase):
+
+    def test_is_exist_ball(self):
+        cluster = build_cluster([(1, 1), (1, 2)])
+
+        self.assertTrue(cluster.is_exist_ball(Ball(Point(1, 2), Color.R)))
+        self.assertFalse(cluster.is_exist_ball(Ball(Point(1, 2), Color.G)))
+        self.assertFalse(cluster.is_exist_ball(Ball(Point(2, 2), Color.R)))
+
+    def test_can_belong(self):
+        cluster = build_cluster([(1, 1), (1, 2), (1, 3)])
+
+        self.assertTrue(cluster.can_belong(build_cluster([(2, 3)])))
+        self.assertTrue(build_cluster([(2, 3)]).can_belong(cluster))
+        self.assertFalse(cluster.can_belong(build_cluster([(2, 4)])))
+        self.assertFalse(cluster.can_belong(build_cluster([(2, 3)], Color.G)))
+
+    def test_merge_smaller_cluster(self):
+        cluster = build_cluster([(2, 1), (2, 2), (3, 2)])
+        other_cluster = build_cluster([(1, 1), (2, 2)])
+
+        cluster.merge(other_cluster)
+
+        self.assertEqual(get_coordinates(cluster), [(2, 1), (2, 2), (3, 2), (1, 1)])
+        self.assertEqual(cluster.get_count_balls(), 4)
+        self.assertEqual(cluster.get_priority_ball().get_point(), Point(1, 1))
+
+        self.assertEqual(get_coordinates(other_cluster), [(1, 1), (2, 2)])
+
+    def test_merge_larger_cluster(self):
+        cluster = build_cluster([(1, 1)])
+        other_cluster = build_cluster([(2, 2), (2, 1), (3, 1)])
+
+        cluster.merge(other_cluster)
+
+        self.assertEqual(sorted(get_coordinates(cluster)), [(1, 1), (2, 1), (2, 2), (3, 1)])
+        self.assertEqual(cluster.get_count_balls(), 4)
+        self.assertEqual(cluster.get_priority_ball().get_point(), Point(1, 1))
+
+        self.assertEqual(get_coordinates(other_cluster), [(2, 2), (2, 1), (3, 1)])
+        self.assertEqual(other_cluster.get_count_balls(), 3)
+        self.assertFalse(other_cluster.is_exist_ball(Ball(Point(1, 1), Color.R)))
+
+    def test_merge_other_color(self):
+        with self.assertRaises(InvalidBallColorClusterException):
+            build_cluster([(1, 1)]).merge(build_cluster([(1, 2)], Color.B))
+
+
+class BoardClusterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.board = build_board_by_rows([b'RRGB', b'GRGB', b'GGBB'], 3, 4)
+
+    def test_board_clusters_are_clusters(self):
+        clusters = list(self.board.get_clusters())
+
+        self.assertEqual(sum(cluster.get_count_balls() for cluster in clusters), 12)
+
+        for cluster in clusters:
+            self.assertIsInstance(cluster, Cluster)
+
+            balls = cluster.get_balls()
+
+            self.assertEqual(len(balls), cluster.get_count_balls())
+            self.assertIs(cluster[0], balls[0])
+            self.assertIn(cluster.get_priority_ball(), balls)
+            self.assertTrue(all(cluster.is_exist_ball(ball) for ball in balls))
+
+    def test_merge_board_clusters(self):
+        clusters = {cluster.get_priority_ball().get_point(): cluster for cluster in self.board.get_clusters()}
+
+        green_cluster = clusters[Point(1, 1)]
+        other_green_cluster = clusters[Point(3, 2)]
+
+        self.assertFalse(green_cluster.can_belong(other_green_cluster))
+
+        green_cluster.merge(other_green_cluster)
+
+        self.assertEqual(green_cluster.get_count_balls(), 5)
+        self.assertEqual(other_green_cluster.get_count_balls(), 2)
+        self.assertTrue(green_cluster.is_exist_ball(Ball(Point(3, 3), Color.G)))
+
+
+if __name__ == '__main__':
+    unittest.main()
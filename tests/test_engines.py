@@ -0,0 +1,145 @@
+import io
+import os
+import random
+import unittest
+
+from main import DEFAULT_COUNT_ROWS, DEFAULT_COUNT_COLUMNS, stream_games, play_batched_games
+from src.entities import Board, Ball, Point, RGBGame, Player, SimpleStrategy
+from src.output import TextMovesWriter
+from src.parser import COLORS_BY_BYTES, BoardsParser
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+SIZES = ((1, 1), (1, 6), (6, 1), (3, 4), (10, 15), (7, 9))
+
+README_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'README.md')
+
+
+def generate_boards_rows(count_boards, seed):
+    generator = random.Random(seed)
+
+    boards_rows = []
+
+    for _ in range(0, count_boards):
+        count_rows, count_columns = generator.choice(SIZES)
+        colors = generator.choice((b'RG', b'RGB'))
+
+        rows = [bytes(generator.choice(colors) for _ in range(0, count_columns)) for _ in range(0, count_rows)]
+
+        boards_rows.append((rows, count_rows, count_columns))
+
+    return boards_rows
+
+
+def read_readme_examples():  # the input and output code blocks of the examples in the section of tests of README
+    with open(README_PATH, encoding='utf-8') as readme:
+        lines = readme.read().split('\n# Тесты\n', 1)[1].split('\n')
+
+    blocks = []
+
+    while '    ```' in lines:
+        start = lines.index('    ```') + 1
+        end = lines.index('    ```', start)
+
+        blocks.append(''.join(line[4:] + '\n' for line in lines[start:end]).encode())
+
+        lines = lines[end + 1:]
+
+    return list(zip(blocks[0::2], blocks[1::2]))
+
+
+def render_games(games):
+    stream = io.BytesIO()
+
+    moves_writer = TextMovesWriter(stream)
+
+    moves_writer.write_games(games)
+    moves_writer.flush()
+
+    return stream.getvalue()
+
+
+def play_board_modes(boards_rows, is_incremental_clusterization, is_vectorized_compression):
+    for rows, count_rows, count_columns in boards_rows:
+        balls = [[Ball(Point(x, y), COLORS_BY_BYTES[code]) for x, code in enumerate(row, 1)]
+                 for y, row in zip(range(1, count_rows + 1), reversed(rows))]
+
+        board = Board(balls, count_rows, count_columns, is_incremental_clusterization, is_vectorized_compression)
+
+        game = RGBGame(Player(), board, SimpleStrategy(board))
+
+        game.run()
+
+        yield game.get_result()
+
+
+class EnginesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.boards_rows = generate_boards_rows(300, seed=1)
+
+        self.expected = render_games(stream_games(self.boards_rows, 'simple'))
+
+    def test_bits_engine(self):
+        self.assertEqual(render_games(stream_games(self.boards_rows, 'simple', engine='bits')), self.expected)
+
+    @unittest.skipIf(numpy is None, 'requires NumPy')
+    def test_batch_engine(self):
+        for batch_size in (1, 3, 64):
+            self.assertEqual(render_games(play_batched_games(self.boards_rows, batch_size)), self.expected)
+
+    def test_board_modes(self):
+        for is_incremental_clusterization in (True, False):
+            for is_vectorized_compression in (True, False):
+                games = play_board_modes(self.boards_rows, is_incremental_clusterization, is_vectorized_compression)
+
+                self.assertEqual(render_games(games), self.expected)
+
+    @unittest.skipIf(numpy is None, 'requires NumPy')
+    def test_array_board(self):
+        from src.array_board import ArrayRGBGame, ArraySimpleStrategy, build_array_board_by_rows
+
+        games = []
+
+        for board_rows in self.boards_rows:
+            array_board = build_array_board_by_rows(*board_rows)
+
+            game = ArrayRGBGame(Player(), array_board, ArraySimpleStrategy(array_board))
+
+            game.run()
+
+            games.append(game.get_result())
+
+        self.assertEqual(render_games(games), self.expected)
+
+
+class ReadmeExamplesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.examples = read_readme_examples()
+
+    def test_examples(self):
+        self.assertEqual(len(self.examples), 8)
+
+        for engine in ('objects', 'bits'):
+            for input_data, output_data in self.examples:
+                boards_parser = BoardsParser(io.BytesIO(input_data), DEFAULT_COUNT_ROWS, DEFAULT_COUNT_COLUMNS)
+
+                games = stream_games(boards_parser.iterate_boards_rows(), 'simple', engine=engine)
+
+                self.assertEqual(render_games(games), output_data)
+
+    @unittest.skipIf(numpy is None, 'requires NumPy')
+    def test_batch_examples(self):
+        for input_data, output_data in self.examples:
+            boards_parser = BoardsParser(io.BytesIO(input_data), DEFAULT_COUNT_ROWS, DEFAULT_COUNT_COLUMNS)
+
+            self.assertEqual(render_games(play_batched_games(boards_parser.iterate_boards_rows(), 64)), output_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import random
+import unittest
+
+from src.entities import RGBGame, Player, SimpleStrategy
+from src.exceptions import InvalidMoveNumberException
+from test_board_fork import MODES, build_board, generate_rows, take_snapshot
+
+
+def replay(rows, modes):  # the snapshots and scores after every move of a game played without history
+    board = build_board(rows, *modes)
+
+    snapshots = [take_snapshot(board)]
+    scores = [0]
+
+    while not board.is_empty() and board.has_moves():
+        cluster = board.get_best_cluster()
+
+        scores.append(scores[-1] + pow(cluster.get_count_balls() - 2, 2))
+
+        board.remove_cluster(cluster)
+
+        snapshots.append(take_snapshot(board))
+
+    bonus = 1000 if board.is_empty() else 0
+
+    return snapshots, scores, bonus
+
+
+class GameHistoryTest(unittest.TestCase):
+
+    def setUp(self):
+        generator = random.Random(11)
+
+        self.boards_rows = [[b'RRGG', b'RRGG', b'BBRR'], [b'RGGB', b'RRBB']]
+
+        self.boards_rows.extend(generate_rows(generator, *size) for size in ((10, 15), (7, 9), (3, 4), (1, 6)))
+
+    def test_rewind(self):
+        for modes in MODES:
+            for rows in self.boards_rows:
+                snapshots, scores, bonus = replay(rows, modes)
+
+                board = build_board(rows, *modes)
+
+                game = RGBGame(Player(), board, SimpleStrategy(board), is_history_recorded=True)
+
+                game.run()
+
+                count_moves = game.get_number_move()
+
+                self.assertEqual(count_moves, len(snapshots) - 1)
+
+                for _ in range(0, 2):
+                    game.rewind(0)
+
+                    self.assertEqual(take_snapshot(board), snapshots[0])
+                    self.assertEqual(game.get_player_score(), 0)
+
+                    game.rewind(count_moves)
+
+                    self.assertEqual(take_snapshot(board), snapshots[-1])
+                    self.assertEqual(game.get_player_score(), scores[-1] + bonus)
+
+    def test_undo_redo(self):
+        for modes in MODES:
+            for rows in self.boards_rows:
+                snapshots, scores, bonus = replay(rows, modes)
+
+                board = build_board(rows, *modes)
+
+                game = RGBGame(Player(), board, SimpleStrategy(board), is_history_recorded=True)
+
+                game.run()
+
+                self.assertFalse(game.redo())
+
+                for number_move in range(len(snapshots) - 2, -1, -1):
+                    self.assertTrue(game.undo())
+
+                    self.assertEqual(game.get_number_move(), number_move)
+                    self.assertEqual(take_snapshot(board), snapshots[number_move])
+                    self.assertEqual(game.get_player_score(), scores[number_move])
+
+                self.assertFalse(game.undo())
+
+                for number_move in range(1, len(snapshots)):
+                    self.assertTrue(game.redo())
+
+                    self.assertEqual(take_snapshot(board), snapshots[number_move])
+
+                self.assertEqual(game.get_player_score(), scores[-1] + bonus)
+
+    def test_bonus(self):
+        snapshots, scores, bonus = replay(self.boards_rows[0], MODES[0])
+
+        self.assertEqual(bonus, 1000)
+
+        board = build_board(self.boards_rows[0], *MODES[0])
+
+        game = RGBGame(Player(), board, SimpleStrategy(board), is_history_recorded=True)
+
+        game.run()
+
+        self.assertEqual(game.get_player_score(), scores[-1] + 1000)
+
+        game.undo()
+
+        self.assertEqual(game.get_player_score(), scores[-2])
+
+        game.redo()
+
+        self.assertEqual(game.get_player_score(), scores[-1] + 1000)
+
+    def test_play_after_rewind(self):  # a new move drops the moves after it, the game goes on as a fresh one
+        for modes in MODES:
+            rows = self.boards_rows[2]
+
+            snapshots, scores, bonus = replay(rows, modes)
+
+            board = build_board(rows, *modes)
+
+            game = RGBGame(Player(), board, SimpleStrategy(board), is_history_recorded=True)
+
+            game.run()
+
+            game.rewind(1)
+
+            game.run()
+
+            self.assertEqual(take_snapshot(board), snapshots[-1])
+            self.assertEqual(game.get_player_score(), scores[-1] + bonus)
+            self.assertEqual(len(game.get_moves()), len(snapshots) - 1)
+
+    def test_invalid_move_number(self):
+        board = build_board(self.boards_rows[0], *MODES[0])
+
+        game = RGBGame(Player(), board, SimpleStrategy(board), is_history_recorded=True)
+
+        game.run()
+
+        self.assertRaises(InvalidMoveNumberException, game.rewind, -1)
+        self.assertRaises(InvalidMoveNumberException, game.rewind, game.get_number_move() + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
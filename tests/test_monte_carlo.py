@@ -0,0 +1,19 @@
+import unittest
+
+from main import stream_games
+from test_engines import generate_boards_rows, render_games
+
+
+class MonteCarloStrategyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.boards_rows = [board_rows for board_rows in generate_boards_rows(40, seed=5) if board_rows[1] < 10][:6]
+
+    def test_rollout_workers(self):  # the default budget is a count of playouts, not a time limit
+        expected = render_games(stream_games(self.boards_rows, 'montecarlo'))
+
+        self.assertEqual(render_games(stream_games(self.boards_rows, 'montecarlo', count_rollout_workers=2)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()